@@ -158,6 +158,13 @@ It should be noted that the sets of attributes and items passed to
 ``RedactedObject`` and ``RedactedDict`` (and ``Inverter``) are saved
 directly, and can be updated by processes outside of the classes.
 
+By default, the proxied object is still consulted for redacted
+attributes and items, so that a nonexistent attribute or key raises
+the usual ``AttributeError`` or ``KeyError``.  Passing ``strict=False``
+to the constructor skips that lookup and returns the redacted value
+directly; this avoids invoking potentially expensive properties or
+other descriptors that would only be discarded.
+
 Environment
 -----------
 
@@ -235,6 +242,15 @@ not suitable for a given application, then, instead of passing the
 class as the factory function, pass the result of calling the class's
 ``with_sep()`` class method with appropriate arguments.
 
+Each modification of one of these specials immediately updates the
+underlying environment variable.  To make several modifications at
+once, use the special as a context manager; the environment variable
+will then be updated only once, when the ``with`` block exits::
+
+    with env['PATH'] as path:
+        path.insert(0, '/opt/bin')
+        path.insert(0, '/opt/sbin')
+
 It should also be noted that ``Environment`` never deletes an instance
 of a special unless a new special factory is registered (or the
 special is deregistered).  This means that the value can be kept
@@ -12,10 +12,6 @@
 # implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
-import six
-
-
-@six.python_2_unicode_compatible
 class StepAddress(object):
     """
     Represent an "address".  An address is a filename and a path
@@ -31,6 +27,8 @@ class StepAddress(object):
     instances with the additional paths.
     """
 
+    __slots__ = ('filename', '_segments', '_path', '_str')
+
     def __init__(self, filename, path=''):
         """
         Initialize a ``StepAddress`` instance.
@@ -40,7 +38,14 @@ class StepAddress(object):
         """
 
         self.filename = filename
-        self.path = path
+
+        # The path is stored as a tuple of segments, which are only
+        # joined when the full path is needed
+        self._segments = (path,) if path else ()
+
+        # Caches of the path and string representation
+        self._path = None
+        self._str = None
 
     def __str__(self):
         """
@@ -50,7 +55,31 @@ class StepAddress(object):
         :rtype: ``str``
         """
 
-        return '%s:%s' % (self.filename, self.path)
+        # Addresses are immutable, so compute the string only once
+        if self._str is None:
+            self._str = self.filename + ':' + self.path
+
+        return self._str
+
+    def _extend(self, segment):
+        """
+        Construct a new address with an additional path segment.
+
+        :param str segment: The path segment to add.
+
+        :returns: The new address.
+        :rtype: ``StepAddress``
+        """
+
+        # Bypass __init__(); only the segments change
+        cls = self.__class__
+        new = cls.__new__(cls)
+        new.filename = self.filename
+        new._segments = self._segments + (segment,)
+        new._path = None
+        new._str = None
+
+        return new
 
     def key(self, key):
         """
@@ -62,7 +91,7 @@ class StepAddress(object):
         :rtype: ``StepAddress``
         """
 
-        return self.__class__(self.filename, self.path + '/%s' % key)
+        return self._extend('/%s' % key)
 
     def idx(self, idx):
         """
@@ -74,4 +103,16 @@ class StepAddress(object):
         :rtype: ``StepAddress``
         """
 
-        return self.__class__(self.filename, self.path + '[%d]' % idx)
+        return self._extend('[%d]' % idx)
+
+    @property
+    def path(self):
+        """
+        The path through the file to the addressed item.
+        """
+
+        # Join the segments only once
+        if self._path is None:
+            self._path = ''.join(self._segments)
+
+        return self._path
@@ -12,14 +12,12 @@
 # implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
-import collections
+import collections.abc
 import os
 import shlex
 import subprocess
 import sys
 
-import six
-
 from stepmaker import exceptions
 from stepmaker import utils
 
@@ -31,6 +29,62 @@ _unset = object()
 PIPE = subprocess.PIPE
 STDOUT = subprocess.STDOUT
 
+# Cache of split command strings, bounded to _SPLIT_CACHE_SIZE entries
+_SPLIT_CACHE_SIZE = 256
+_split_cache = {}
+
+# Maximum number of canonicalized filenames cached per Environment
+_FILENAME_CACHE_SIZE = 1024
+
+# Converts path-like objects to strings; os.fspath() is new in 3.6
+_fspath = getattr(os, 'fspath', str)
+
+
+def _intern(name):
+    """
+    Intern an environment variable name.  Environment variable names
+    are hashed and compared on every access; storing interned names
+    allows dictionary lookups with interned strings (such as string
+    literals) to succeed on a pointer comparison.
+
+    :param str name: The name of the environment variable.
+
+    :returns: The interned name.  Names that cannot be interned are
+              returned unchanged.
+    :rtype: ``str``
+    """
+
+    return sys.intern(name) if type(name) is str else name
+
+
+def _split_args(args):
+    """
+    Convert a shell command into a list of arguments.  Command strings
+    are split using ``shlex.split()``; since command strings are often
+    reused, the results of the split are cached.
+
+    :param args: The shell command.  May be either a list of strings,
+                 or a string that will be split using
+                 ``shlex.split()``.
+
+    :returns: The list of arguments.
+    :rtype: ``list`` of ``str``
+    """
+
+    # Leave sequences alone
+    if not isinstance(args, str):
+        return args
+
+    # Consult the cache
+    split = _split_cache.get(args)
+    if split is None:
+        split = tuple(shlex.split(args))
+        if len(_split_cache) < _SPLIT_CACHE_SIZE:
+            _split_cache[args] = split
+
+    # Return a fresh list so callers can't corrupt the cache
+    return list(split)
+
 
 class CompletedProcess(object):
     """
@@ -39,6 +93,8 @@ class CompletedProcess(object):
     ``stdout``, and ``stderr`` attributes.
     """
 
+    __slots__ = ('args', 'returncode', 'stdout', 'stderr')
+
     def __init__(self, args, returncode, stdout=None, stderr=None):
         """
         Initialize a ``CompletedProcess`` instance.
@@ -56,7 +112,55 @@ class CompletedProcess(object):
         self.stderr = stderr
 
 
-class Environment(collections.MutableMapping):
+class _ItemsView(collections.abc.ItemsView):
+    """
+    A view of the environment variable names and values.  Whether
+    specials are registered is checked each time the view is
+    iterated, so the underlying dictionary can be iterated directly
+    when there are none.
+    """
+
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Iterate over the environment variable names and values.
+
+        :returns: An iterator over the (name, value) pairs.
+        """
+
+        # Without specials, the raw values are the values
+        if not self._mapping._specials:
+            return iter(self._mapping._environ.items())
+
+        return super(_ItemsView, self).__iter__()
+
+
+class _ValuesView(collections.abc.ValuesView):
+    """
+    A view of the environment variable values.  Whether specials are
+    registered is checked each time the view is iterated, so the
+    underlying dictionary can be iterated directly when there are
+    none.
+    """
+
+    __slots__ = ()
+
+    def __iter__(self):
+        """
+        Iterate over the environment variable values.
+
+        :returns: An iterator over the values.
+        """
+
+        # Without specials, the raw values are the values
+        if not self._mapping._specials:
+            return iter(self._mapping._environ.values())
+
+        return super(_ValuesView, self).__iter__()
+
+
+class Environment(collections.abc.MutableMapping):
     """
     Represent an execution environment.  This is a dictionary-like
     class containing environment variables, but a current working
@@ -94,13 +198,29 @@ class Environment(collections.MutableMapping):
         """
 
         # Set up the base values
-        self._environ = environ or os.environ.copy()
-        self._cwd = utils._canonicalize_path(os.getcwd(), cwd or os.curdir)
+        self._environ = environ or dict(
+            (_intern(name), value) for name, value in os.environ.items()
+        )
         self._specials = specials
 
+        # Canonicalize the working directory; the process's working
+        # directory is only needed if cwd is relative
+        if cwd and utils._isabs(cwd):
+            self._cwd = os.path.normpath(cwd)
+        else:
+            self._cwd = utils._canonicalize_path(
+                os.getcwd(), cwd or os.curdir,
+            )
+
         # Cache of bound specials
         self._special_cache = {}
 
+        # Default keyword arguments for subprocess.Popen
+        self._popen_defaults = {'env': self._environ, 'close_fds': True}
+
+        # Cache of canonicalized relative filenames
+        self._filename_cache = {}
+
     def __len__(self):
         """
 iter(        Return the number of environment variables.
@@ -120,6 +240,19 @@ iter(        Return the number of environment variables.
 
         return iter(self._environ)
 
+    def __contains__(self, name):
+        """
+        Determine if an environment variable is set.
+
+        :param str name: The name of the environment variable.
+
+        :returns: A ``True`` value if the environment variable is set,
+                  ``False`` otherwise.
+        :rtype: ``bool``
+        """
+
+        return name in self._environ
+
     def __getitem__(self, name):
         """
         Retrieve the value of an environment variable.
@@ -134,16 +267,15 @@ iter(        Return the number of environment variables.
             The environment variable is not set.
         """
 
-        # Is the variable even set?
-        if name not in self._environ:
-            raise KeyError(name)
+        # Retrieve the raw value; raises KeyError if it's not set
+        value = self._environ[name]
 
         # Retrieve the special object
-        if name in self._specials:
+        if self._specials and name in self._specials:
             return self._get_special(name)
 
         # OK, return the raw value
-        return self._environ[name]
+        return value
 
     def __setitem__(self, name, value):
         """
@@ -157,11 +289,11 @@ iter(        Return the number of environment variables.
                       values.
         """
 
-        if name in self._specials:
+        if self._specials and name in self._specials:
             # If it's a special, defer to its set() method
             self._get_special(name).set(value)
         else:
-            self._environ[name] = value
+            self._environ[_intern(name)] = value
 
     def __delitem__(self, name):
         """
@@ -173,17 +305,18 @@ iter(        Return the number of environment variables.
             The environment variable is not set.
         """
 
-        # Is the variable even set?
-        if name not in self._environ:
-            raise KeyError(name)
-
         # If there's a special, defer to its delete() method
-        if name in self._specials:
+        if self._specials and name in self._specials:
+            # Is the variable even set?
+            if name not in self._environ:
+                raise KeyError(name)
+
             self._get_special(name).delete()
         else:
+            # Raises KeyError if the variable isn't set
             del self._environ[name]
 
-    def __call__(self, args, **kwargs):
+    def __call__(self, args, *, input=None, check=False, **kwargs):
         """
         Invoke and then wait for a shell command.  Accepts the same
         keyword arguments as ``subprocess.Popen``, with the additions
@@ -194,13 +327,14 @@ iter(        Return the number of environment variables.
         :param args: The shell command.  May be either a list of
                      strings, or a string that will be split using
                      ``shlex.split()``.
-        :param str input: A keyword-only argument.  Provides input to
-                          send to the standard input of the process.
-                          Note that this is incompatible with the
-                          ``subprocess.Popen`` ``stdin`` argument.
-        :param bool check: A keyword-only argument.  If ``True``, the
-                           return code of the command will be checked,
-                           and, if non-zero, a
+        :param str input: Must be passed as a keyword argument.
+                          Provides input to send to the standard input
+                          of the process.  Note that this is
+                          incompatible with the ``subprocess.Popen``
+                          ``stdin`` argument.
+        :param bool check: Must be passed as a keyword argument.  If
+                           ``True``, the return code of the command
+                           will be checked, and, if non-zero, a
                            ``stepmaker.ProcessError`` exception will
                            be raised.
 
@@ -209,30 +343,27 @@ iter(        Return the number of environment variables.
         """
 
         # Check for input argument conflict
-        if 'input' in kwargs and 'stdin' in kwargs:
-            raise ValueError('Cannot use both "input" and "stdin" arguments')
-        input_ = kwargs.pop('input', None)
-        if input_:
-            kwargs['stdin'] = PIPE
-
-        # Figure out if we're to check the result
-        check = kwargs.pop('check', False)
+        if input is not None:
+            if 'stdin' in kwargs:
+                raise ValueError(
+                    'Cannot use both "input" and "stdin" arguments'
+                )
+            if input:
+                kwargs['stdin'] = PIPE
 
         # Convert string args into a sequence
-        if isinstance(args, six.string_types):
-            args = shlex.split(args)
+        args = _split_args(args)
 
         # Initiate the process
         process = self._system(args, kwargs)
 
         # Send it input and wait for it to complete
         try:
-            stdout, stderr = process.communicate(input_)
+            stdout, stderr = process.communicate(input)
         except Exception:
-            exc_data = sys.exc_info()
             process.kill()
             process.wait()
-            six.reraise(*exc_data)
+            raise
 
         # Grab the return code and construct a CompletedProcess
         result = CompletedProcess(args, process.poll(), stdout, stderr)
@@ -255,10 +386,12 @@ iter(        Return the number of environment variables.
         """
 
         # Create and cache the special, if necessary
-        if name not in self._special_cache:
-            self._special_cache[name] = self._specials[name](self, name)
+        special = self._special_cache.get(name)
+        if special is None:
+            special = self._specials[name](self, name)
+            self._special_cache[name] = special
 
-        return self._special_cache[name]
+        return special
 
     def _set(self, name, value):
         """
@@ -273,7 +406,7 @@ iter(        Return the number of environment variables.
                           to.
         """
 
-        self._environ[name] = value
+        self._environ[_intern(name)] = value
 
     def _delete(self, name):
         """
@@ -302,18 +435,68 @@ iter(        Return the number of environment variables.
         :rtype: ``subprocess.Popen``
         """
 
+        # Merge the keyword arguments over our defaults
+        popen_kwargs = self._popen_defaults.copy()
+        popen_kwargs.update(kwargs)
+
         # Interpret cwd relative to ours
-        kwargs['cwd'] = (
+        popen_kwargs['cwd'] = (
             self.filename(kwargs['cwd']) if 'cwd' in kwargs else self._cwd
         )
 
-        # Use us as the environment
-        kwargs.setdefault('env', self._environ)
+        return subprocess.Popen(args, **popen_kwargs)
+
+    def get(self, name, default=None):
+        """
+        Retrieve the value of an environment variable, if it is set.
+
+        :param str name: The name of the environment variable.
+        :param default: A default to return, if the environment
+                        variable is not set.
+
+        :returns: The value of the environment variable, or
+                  ``default``.  Note that this may not be a string if
+                  a special has been registered for this variable.
+        """
 
-        # Set a default for close_fds
-        kwargs.setdefault('close_fds', True)
+        # Specials only apply if the variable is set
+        if self._specials and name in self._specials:
+            if name not in self._environ:
+                return default
 
-        return subprocess.Popen(args, **kwargs)
+            return self._get_special(name)
+
+        return self._environ.get(name, default)
+
+    def keys(self):
+        """
+        Obtain a view of the environment variable names.
+
+        :returns: A set-like view of the environment variable names.
+        """
+
+        return self._environ.keys()
+
+    def items(self):
+        """
+        Obtain a view of the environment variable names and values.
+
+        :returns: A set-like view of the (name, value) pairs.  Note
+                  that values may not be strings if specials have been
+                  registered.
+        """
+
+        return _ItemsView(self)
+
+    def values(self):
+        """
+        Obtain a view of the environment variable values.
+
+        :returns: A view of the values.  Note that values may not be
+                  strings if specials have been registered.
+        """
+
+        return _ValuesView(self)
 
     def setdefault(self, key, default=None):
         """
@@ -345,9 +528,17 @@ iter(        Return the number of environment variables.
         :rtype: ``Environment``
         """
 
-        return self.__class__(
-            self._environ.copy(), self._cwd, **self._specials
-        )
+        # Bypass __init__(); the working directory is already
+        # canonical, and the specials don't need repacking
+        new = self.__class__.__new__(self.__class__)
+        new._environ = self._environ.copy()
+        new._cwd = self._cwd
+        new._specials = self._specials.copy()
+        new._special_cache = {}
+        new._popen_defaults = {'env': new._environ, 'close_fds': True}
+        new._filename_cache = self._filename_cache.copy()
+
+        return new
 
     def register(self, name, special=None):
         """
@@ -377,8 +568,12 @@ iter(        Return the number of environment variables.
         if self._specials.get(name) == special:
             return self._specials.get(name)
 
-        # Invalidate the special cache
-        self._special_cache.pop(name, None)
+        # Invalidate the special cache, detaching any bound special so
+        # it doesn't report a stale value
+        bound = self._special_cache.pop(name, None)
+        detach = getattr(bound, '_detach', None)
+        if detach is not None:
+            detach()
 
         # Unregister the current special factory
         old = self._specials.pop(name, None)
@@ -417,20 +612,38 @@ iter(        Return the number of environment variables.
         Resolve the full path to a given file relative to the current
         working directory of this environment.
 
-        :param str filename: The filename to resolve.
+        :param filename: The filename to resolve.
+        :type filename: ``str`` or path-like object
 
         :returns: The absolute path to the file.
         :rtype: ``str``
         """
 
-        return utils._canonicalize_path(self._cwd, filename)
+        # Convert path-like objects
+        if not isinstance(filename, str):
+            filename = _fspath(filename)
+
+        # Absolute paths only need to be normalized
+        if utils._isabs(filename):
+            return os.path.normpath(filename)
+
+        # Relative paths are resolved against our cwd; cache them,
+        # since the same files tend to be referenced repeatedly
+        result = self._filename_cache.get(filename)
+        if result is None:
+            result = utils._canonicalize_path(self._cwd, filename)
+            if len(self._filename_cache) < _FILENAME_CACHE_SIZE:
+                self._filename_cache[filename] = result
+
+        return result
 
     def open(self, filename, mode='r', buffering=-1):
         """
         Open a file relative to the current working directory of this
         environment.
 
-        :param str filename: The filename to open.
+        :param filename: The filename to open.
+        :type filename: ``str`` or path-like object
         :param str mode: The mode with which to open the file.
                          Defaults to 'r'.
         :param int buffering: The buffering mode.  Has the same
@@ -464,8 +677,7 @@ iter(        Return the number of environment variables.
         """
 
         # Convert string args into a sequence
-        if isinstance(args, six.string_types):
-            args = shlex.split(args)
+        args = _split_args(args)
 
         return self._system(args, kwargs)
 
@@ -490,3 +702,6 @@ iter(        Return the number of environment variables.
         """
 
         self._cwd = self.filename(value)
+
+        # Cached filenames were relative to the old directory
+        self._filename_cache = {}
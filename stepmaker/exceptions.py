@@ -12,9 +12,45 @@
 # implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import functools
 import signal
 
-import six
+
+# Mapping of signal numbers to signal names
+_SIGNAL_NAMES = {}
+for _name, _value in signal.__dict__.items():
+    if _name.startswith('SIG') and not _name.startswith('SIG_'):
+        _SIGNAL_NAMES.setdefault(_value, _name)
+del _name, _value
+
+# Message templates for ProcessError
+_MSG_SIGNAL = 'Command "{0}" died with {1}'
+_MSG_UNKNOWN_SIGNAL = 'unknown signal {0:d}'
+_MSG_NONZERO = 'Command "{0}" returned non-zero exit status {1:d}'
+_MSG_SUCCESS = 'Command "{0}" successful'
+
+
+@functools.lru_cache(maxsize=None)
+def _signame(signum):
+    """
+    Resolve a signal number to a signal name.  Results are cached,
+    since the set of signal numbers is small and fixed.
+
+    :param int signum: The signal number.
+
+    :returns: The name of the signal, or a description indicating the
+              signal is unknown.
+    :rtype: ``str``
+    """
+
+    try:
+        return signal.Signals(signum).name
+    except AttributeError:  # pragma: no cover
+        # Doesn't have Signals (Python < 3.5); fall back to the
+        # lookup table
+        return _SIGNAL_NAMES.get(signum, _MSG_UNKNOWN_SIGNAL.format(signum))
+    except ValueError:
+        return _MSG_UNKNOWN_SIGNAL.format(signum)
 
 
 class StepError(Exception):
@@ -84,47 +120,29 @@ class ProcessError(Exception):
         """
 
         # Construct a message
-        if result.returncode and result.returncode < 0:
-            # Died due to a signal; figure out the signal name
-            signame = None
-
-            # Try the Python 3 method of resolving the signal name
-            if six.PY3:  # pragma: no cover
-                try:
-                    signame = signal.Signals(-result.returncode).name
-                except AttributeError:
-                    # Doesn't have Signals, we'll fall back to the
-                    # Python 2 method
-                    pass
-                except ValueError:
-                    signame = 'unknown signal %d' % -result.returncode
-
-            if signame is None:  # pragma: no cover
-                # Python 2 version of signal name lookup
-                for name, value in signal.__dict__.items():
-                    if (name.startswith('SIG') and
-                            not name.startswith('SIG_') and
-                            value == -result.returncode):
-                        signame = name
-                        break
-
-            if signame is None:
-                # Guess we don't know the signal name
-                signame = 'unknown signal %d' % -result.returncode
-
-            super(ProcessError, self).__init__(
-                'Command "%s" died with %s' % (result.args[0], signame)
-            )
-        elif result.returncode:
+        rc = result.returncode
+        if not rc:
+            # Did it really fail?
+            msg = _MSG_SUCCESS.format(result.args[0])
+        elif rc > 0:
             # Non-zero error code
-            super(ProcessError, self).__init__(
-                'Command "%s" returned non-zero exit status %d' %
-                (result.args[0], result.returncode)
-            )
+            msg = _MSG_NONZERO.format(result.args[0], rc)
         else:
-            # Did it really fail?
-            super(ProcessError, self).__init__(
-                'Command "%s" successful' % result.args[0]
-            )
+            # Died due to a signal
+            msg = _MSG_SIGNAL.format(result.args[0], _signame(-rc))
+
+        super(ProcessError, self).__init__(msg)
 
         self.result = result
+
+    def __reduce__(self):
+        """
+        Support copying and pickling.  The default implementation
+        would pass the message to ``__init__()`` in place of the
+        process result.
+
+        :returns: A tuple describing how to reconstruct the exception.
+        :rtype: ``tuple``
+        """
+
+        return (self.__class__, (self.result,), self.__dict__)
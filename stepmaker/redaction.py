@@ -12,18 +12,21 @@
 # implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
-import collections
+import collections.abc
+import sys
 
-import six
 
-
-@six.python_2_unicode_compatible
 class Redacted(object):
     """
     Class for objects indicating key values that have been redacted.
     This is used in conjunction with the ``RedactedDict`` proxy class.
+    Instances compare by identity, so code that needs to know whether
+    a value was redacted should test ``value is redacted`` rather
+    than converting it to a string.
     """
 
+    __slots__ = ('text',)
+
     def __init__(self, text='<redacted>'):
         """
         Initialize a ``Redacted`` instance.
@@ -32,7 +35,9 @@ class Redacted(object):
                          '<redacted>'.
         """
 
-        self.text = text
+        # Intern the text, so that instances with the same text share
+        # a single string
+        self.text = sys.intern(text) if type(text) is str else text
 
     def __str__(self):
         """
@@ -44,10 +49,33 @@ class Redacted(object):
 
         return self.text
 
+    # The representation is the same as the string form
+    __repr__ = __str__
+
 
 # Create a singleton for Redacted* classes to default to
 redacted = Redacted()
 
+# Shared default for proxies that redact nothing
+_EMPTY = frozenset()
+
+# Sentinel for detecting omitted arguments
+_NOT_SET = object()
+
+# The proxies read their internal attributes with this to avoid
+# recursing into __getattr__(); binding it once saves a lookup per call
+_getattribute = object.__getattribute__
+
+# Names of the internal attributes of the Redacted* proxy classes
+_INTERNAL_ATTRS = frozenset([
+    '__redacted_obj__',
+    '__redacted_attrs__',
+    '__redacted__',
+    '__redacted_strict__',
+    '__redacted_keys__',
+    '__redacted_len__',
+])
+
 
 class RedactedObject(object):
     """
@@ -58,23 +86,37 @@ class RedactedObject(object):
     redacted.
     """
 
-    def __init__(self, obj, redacted_attrs=None, redacted=redacted):
+    __slots__ = ('__redacted_obj__', '__redacted_attrs__', '__redacted__',
+                 '__redacted_strict__')
+
+    def __init__(self, obj, redacted_attrs=None, redacted=redacted,
+                 strict=True):
         """
         Initialize a ``RedactedObject`` instance.
 
         :param obj: The object to proxy for.
         :param redacted_attrs: Attributes to mark redacted.  The set
                                passed here can be updated by processes
-                               outside of the class.
+                               outside of the class.  If not provided,
+                               no attributes will be redacted.
         :type redacted_attrs: ``set`` of ``str``
         :param redacted: The object to return for redacted keys.
                          Defaults to the ``redacted`` singleton.
         :type redacted: ``Redacted``
+        :param bool strict: If ``True`` (the default), redacted
+                            attributes are still looked up on the
+                            proxied object, so that ``AttributeError``
+                            is raised if they don't exist.  If
+                            ``False``, the redacted value is returned
+                            without consulting the proxied object.
         """
 
         self.__redacted_obj__ = obj
-        self.__redacted_attrs__ = redacted_attrs or set()
+        self.__redacted_attrs__ = (
+            _EMPTY if redacted_attrs is None else redacted_attrs
+        )
         self.__redacted__ = redacted
+        self.__redacted_strict__ = strict
 
     def __getattr__(self, name):
         """
@@ -88,11 +130,28 @@ class RedactedObject(object):
             The attribute does not exist on the proxied object.
         """
 
-        # Proxy to the object; this allows the object to do whatever
-        # it does with attribute access even if it's redacted, while
-        # still allowing AttributeError to be raised
-        value = getattr(self.__redacted_obj__, name)
-        return self.__redacted__ if name in self.__redacted_attrs__ else value
+        # Note: proxying is deliberately done here rather than in
+        # __getattribute__(); that way, attributes of the proxy class
+        # itself (e.g., the mapping methods of RedactedDict) take
+        # precedence, and access to them doesn't pay for a call into
+        # Python code.
+
+        # Bind the internal attributes
+        obj = _getattribute(self, '__redacted_obj__')
+        attrs = _getattribute(self, '__redacted_attrs__')
+
+        # Most proxies redact nothing; skip hashing the name if so
+        if not attrs or name not in attrs:
+            return getattr(obj, name)
+
+        # In strict mode, proxy to the object anyway; this allows the
+        # object to do whatever it does with attribute access even if
+        # it's redacted, while still allowing AttributeError to be
+        # raised
+        if _getattribute(self, '__redacted_strict__'):
+            getattr(obj, name)
+
+        return _getattribute(self, '__redacted__')
 
     def __setattr__(self, name, value):
         """
@@ -103,10 +162,10 @@ class RedactedObject(object):
         """
 
         # Is it one of our internal attributes?
-        if name.startswith('__redacted_') and name.endswith('__'):
+        if name in _INTERNAL_ATTRS:
             super(RedactedObject, self).__setattr__(name, value)
         else:
-            setattr(self.__redacted_obj__, name, value)
+            setattr(_getattribute(self, '__redacted_obj__'), name, value)
 
     def __delattr__(self, name):
         """
@@ -119,23 +178,27 @@ class RedactedObject(object):
         """
 
         # Is it one of our internal attributes?
-        if name.startswith('__redacted_') and name.endswith('__'):
+        if name in _INTERNAL_ATTRS:
             super(RedactedObject, self).__delattr__(name)
         else:
-            delattr(self.__redacted_obj__, name)
+            delattr(_getattribute(self, '__redacted_obj__'), name)
 
 
-class RedactedDict(RedactedObject, collections.MutableMapping):
+class RedactedDict(RedactedObject):
     """
     A proxy class for a dictionary.  This proxies all attribute and
     item accesses to an underlying object, but allows certain keys to
     be marked as "redacted"; attempts to obtain the values of those
     keys will return a designated object to indicate that their values
-    are redacted.
+    are redacted.  The mapping methods are implemented directly,
+    rather than inherited from ``MutableMapping``; the class is
+    registered as a ``MutableMapping``, however.
     """
 
+    __slots__ = ('__redacted_keys__', '__redacted_len__')
+
     def __init__(self, obj, redacted_keys=None, redacted_attrs=None,
-                 redacted=redacted):
+                 redacted=redacted, strict=True, frozen=False):
         """
         Initialize a ``RedactedDict`` instance.
 
@@ -143,7 +206,8 @@ class RedactedDict(RedactedObject, collections.MutableMapping):
                     for.
         :param redacted_keys: Dictionary keys to mark redacted.  The
                               set passed here can be updated by
-                              processes outside of the class.
+                              processes outside of the class.  If not
+                              provided, no keys will be redacted.
         :type redacted_keys: ``set`` of ``str``
         :param redacted_attrs: Attributes to mark redacted.  The set
                                passed here can be updated by processes
@@ -152,10 +216,26 @@ class RedactedDict(RedactedObject, collections.MutableMapping):
         :param redacted: The object to return for redacted keys.
                          Defaults to the ``redacted`` singleton.
         :type redacted: ``Redacted``
+        :param bool strict: If ``True`` (the default), redacted keys
+                            and attributes are still looked up on the
+                            proxied object, so that ``KeyError`` or
+                            ``AttributeError`` is raised if they don't
+                            exist.  If ``False``, the redacted value is
+                            returned without consulting the proxied
+                            object.
+        :param bool frozen: If ``True``, the proxied object is assumed
+                            not to change; its length is computed
+                            once, and attempts to set or delete items
+                            through the proxy raise ``TypeError``.
+                            Defaults to ``False``.
         """
 
-        super(RedactedDict, self).__init__(obj, redacted_attrs, redacted)
-        self.__redacted_keys__ = redacted_keys or set()
+        super(RedactedDict, self).__init__(obj, redacted_attrs, redacted,
+                                           strict)
+        self.__redacted_keys__ = (
+            _EMPTY if redacted_keys is None else redacted_keys
+        )
+        self.__redacted_len__ = len(obj) if frozen else None
 
     def __len__(self):
         """
@@ -165,7 +245,12 @@ class RedactedDict(RedactedObject, collections.MutableMapping):
         :rtype: ``int``
         """
 
-        return len(self.__redacted_obj__)
+        # Use the cached length if the proxy is frozen
+        length = _getattribute(self, '__redacted_len__')
+        if length is None:
+            return len(_getattribute(self, '__redacted_obj__'))
+
+        return length
 
     def __iter__(self):
         """
@@ -174,7 +259,23 @@ class RedactedDict(RedactedObject, collections.MutableMapping):
         :returns: An iterator over the proxied object.
         """
 
-        return iter(self.__redacted_obj__)
+        return iter(_getattribute(self, '__redacted_obj__'))
+
+    def __contains__(self, name):
+        """
+        Determine if a key exists in the proxied object.  This
+        delegates directly to the proxied object, rather than going
+        through ``__getitem__()`` as the ``MutableMapping`` mixin
+        would.
+
+        :param str name: The key to test for.
+
+        :returns: A ``True`` value if the key exists, ``False``
+                  otherwise.
+        :rtype: ``bool``
+        """
+
+        return name in _getattribute(self, '__redacted_obj__')
 
     def __getitem__(self, name):
         """
@@ -189,11 +290,77 @@ class RedactedDict(RedactedObject, collections.MutableMapping):
             The key does not exist on the proxied object.
         """
 
-        # Proxy to the object; this allows the object to magically
-        # create the key even if it's redacted, while still allowing
-        # KeyError to be raised
-        value = self.__redacted_obj__[name]
-        return self.__redacted__ if name in self.__redacted_keys__ else value
+        # Bind the internal attributes
+        obj = _getattribute(self, '__redacted_obj__')
+        keys = _getattribute(self, '__redacted_keys__')
+
+        # Most proxies redact nothing; skip hashing the key if so
+        if not keys or name not in keys:
+            return obj[name]
+
+        # In strict mode, proxy to the object anyway; this allows the
+        # object to magically create the key even if it's redacted,
+        # while still allowing KeyError to be raised
+        if _getattribute(self, '__redacted_strict__'):
+            obj[name]
+
+        return _getattribute(self, '__redacted__')
+
+    def get(self, name, default=None):
+        """
+        Retrieve an item from the proxied object, returning a default
+        if it does not exist.
+
+        :param str name: The key to retrieve.
+        :param default: The value to return if the key does not
+                        exist.  Defaults to ``None``.
+
+        :returns: The value of the key, the ``redacted`` parameter to
+                  the constructor if the key has been redacted, or
+                  the value of ``default``.
+        """
+
+        # Bind the internal attributes
+        obj = _getattribute(self, '__redacted_obj__')
+        keys = _getattribute(self, '__redacted_keys__')
+
+        try:
+            # Most proxies redact nothing; skip hashing the key if so
+            if not keys or name not in keys:
+                return obj[name]
+
+            # As with __getitem__(), only consult the object for
+            # redacted keys in strict mode
+            if _getattribute(self, '__redacted_strict__'):
+                obj[name]
+        except KeyError:
+            return default
+
+        return _getattribute(self, '__redacted__')
+
+    def items_redacted(self):
+        """
+        Retrieve all the items of the proxied object at once, with the
+        values of redacted keys replaced.  This is cheaper than
+        retrieving each item in turn, e.g., when serializing the whole
+        dictionary.
+
+        :returns: A list of key, value tuples.  The value will be the
+                  ``redacted`` parameter to the constructor if the key
+                  has been redacted.
+        :rtype: ``list``
+        """
+
+        # Bind the internal attributes
+        obj = _getattribute(self, '__redacted_obj__')
+        keys = _getattribute(self, '__redacted_keys__')
+
+        # Most proxies redact nothing
+        if not keys:
+            return list(obj.items())
+
+        redacted = _getattribute(self, '__redacted__')
+        return [(k, redacted if k in keys else v) for k, v in obj.items()]
 
     def __setitem__(self, name, value):
         """
@@ -201,9 +368,15 @@ class RedactedDict(RedactedObject, collections.MutableMapping):
 
         :param str name: The name of the item to set.
         :param value: The value to set the item to.
+
+        :raises TypeError:
+            The proxy is frozen.
         """
 
-        self.__redacted_obj__[name] = value
+        if _getattribute(self, '__redacted_len__') is not None:
+            raise TypeError('Cannot set items of a frozen RedactedDict')
+
+        _getattribute(self, '__redacted_obj__')[name] = value
 
     def __delitem__(self, name):
         """
@@ -213,9 +386,168 @@ class RedactedDict(RedactedObject, collections.MutableMapping):
 
         :raises KeyError:
             The key does not exist on the proxied object.
+        :raises TypeError:
+            The proxy is frozen.
+        """
+
+        if _getattribute(self, '__redacted_len__') is not None:
+            raise TypeError('Cannot delete items of a frozen RedactedDict')
+
+        del _getattribute(self, '__redacted_obj__')[name]
+
+    # Defining __eq__() makes instances unhashable, like a dict
+    def __eq__(self, other):
+        """
+        Compare the proxy to another mapping.  Redacted values compare
+        as the ``redacted`` parameter to the constructor.
+
+        :param other: The object to compare to.
+
+        :returns: A ``True`` value if the mappings have the same items,
+                  ``False`` otherwise, or ``NotImplemented`` if
+                  ``other`` is not a mapping.
+        """
+
+        if not isinstance(other, collections.abc.Mapping):
+            return NotImplemented
+
+        return dict(self.items_redacted()) == dict(other.items())
+
+    def keys(self):
+        """
+        Retrieve the keys of the proxied object.
+
+        :returns: A view of the keys of the proxied object.
         """
 
-        del self.__redacted_obj__[name]
+        return _getattribute(self, '__redacted_obj__').keys()
+
+    def items(self):
+        """
+        Retrieve the items of the proxied object.
+
+        :returns: A view of the items of the proxied object, with the
+                  values of redacted keys replaced.
+        """
+
+        return collections.abc.ItemsView(self)
+
+    def values(self):
+        """
+        Retrieve the values of the proxied object.
+
+        :returns: A view of the values of the proxied object, with the
+                  values of redacted keys replaced.
+        """
+
+        return collections.abc.ValuesView(self)
+
+    def pop(self, name, default=_NOT_SET):
+        """
+        Remove an item from the proxied object and return its value.
+
+        :param str name: The key to remove.
+        :param default: The value to return if the key does not
+                        exist.  If not provided, ``KeyError`` is
+                        raised instead.
+
+        :returns: The value of the key, the ``redacted`` parameter to
+                  the constructor if the key has been redacted, or
+                  the value of ``default``.
+
+        :raises KeyError:
+            The key does not exist on the proxied object, and no
+            default was provided.
+        :raises TypeError:
+            The proxy is frozen.
+        """
+
+        try:
+            value = self[name]
+        except KeyError:
+            if default is _NOT_SET:
+                raise
+            return default
+
+        del self[name]
+        return value
+
+    def popitem(self):
+        """
+        Remove an arbitrary item from the proxied object and return it.
+
+        :returns: A key, value tuple.  The value will be the
+                  ``redacted`` parameter to the constructor if the key
+                  has been redacted.
+        :rtype: ``tuple``
+
+        :raises KeyError:
+            The proxied object is empty.
+        :raises TypeError:
+            The proxy is frozen.
+        """
+
+        try:
+            name = next(iter(self))
+        except StopIteration:
+            raise KeyError('popitem(): dictionary is empty')
+
+        value = self[name]
+        del self[name]
+        return name, value
+
+    def clear(self):
+        """
+        Remove all items from the proxied object.
+
+        :raises TypeError:
+            The proxy is frozen.
+        """
+
+        if _getattribute(self, '__redacted_len__') is not None:
+            raise TypeError('Cannot delete items of a frozen RedactedDict')
+
+        _getattribute(self, '__redacted_obj__').clear()
+
+    def update(self, *args, **kwargs):
+        """
+        Update the proxied object.  Takes the same arguments as
+        ``dict.update()``.
+
+        :raises TypeError:
+            The proxy is frozen.
+        """
+
+        if _getattribute(self, '__redacted_len__') is not None:
+            raise TypeError('Cannot set items of a frozen RedactedDict')
+
+        _getattribute(self, '__redacted_obj__').update(*args, **kwargs)
+
+    def setdefault(self, name, default=None):
+        """
+        Retrieve an item from the proxied object, setting it to a
+        default if it does not exist.
+
+        :param str name: The key to retrieve.
+        :param default: The value to set the key to if it does not
+                        exist.  Defaults to ``None``.
+
+        :returns: The value of the key, the ``redacted`` parameter to
+                  the constructor if the key has been redacted, or
+                  the value of ``default``.
+
+        :raises TypeError:
+            The proxy is frozen and the key does not exist.
+        """
+
+        try:
+            return self[name]
+        except KeyError:
+            self[name] = default
+            return default
+
+
+collections.abc.MutableMapping.register(RedactedDict)
 
 
 class Inverter(object):
@@ -226,13 +558,25 @@ class Inverter(object):
     use white-list policies without additional code.
     """
 
+    __slots__ = ('_base',)
+
     def __init__(self, base):
         """
         Initialize an ``Inverter`` instance.
 
-        :param set base: The set to invert the sense of.
+        :param set base: The set to invert the sense of.  This may be
+                         any object implementing ``__contains__()``,
+                         and is saved directly, so it can be updated
+                         by processes outside of the class; lists and
+                         tuples are copied into a ``frozenset``, to
+                         ensure membership tests are not linear scans.
         """
 
+        # Membership tests are performed on every attribute or item
+        # access, so make sure they're not scans of a sequence
+        if isinstance(base, (list, tuple)):
+            base = frozenset(base)
+
         self._base = base
 
     def __contains__(self, item):
@@ -249,3 +593,28 @@ class Inverter(object):
         """
 
         return item not in self._base
+
+    def materialize(self, universe):
+        """
+        Compute the inverted set over a known universe of items.  When
+        all the attributes or keys that could be looked up are known
+        in advance, the result may be passed to ``RedactedObject`` or
+        ``RedactedDict`` in place of the ``Inverter``, making each
+        membership test a plain set lookup.  Note that, unlike the
+        ``Inverter`` itself, the result will not reflect later updates
+        to the underlying set.
+
+        :param universe: The items that could be tested for
+                         membership.
+
+        :returns: The items of ``universe`` that are not members of
+                  the underlying set.
+        :rtype: ``frozenset``
+        """
+
+        if isinstance(self._base, (collections.abc.Set,
+                                   collections.abc.Mapping)):
+            return frozenset(universe).difference(self._base)
+
+        # The base need not be iterable, so test each item
+        return frozenset(item for item in universe if item not in self._base)
@@ -13,22 +13,156 @@
 # permissions and limitations under the License.
 
 import abc
+import bisect
 import collections
+import collections.abc
 import functools
 import os
+import sys
 
-import six
 
+# Plain dictionaries preserve insertion order as of Python 3.7, and are
+# cheaper than OrderedDict
+_OrderedDict = dict if sys.version_info >= (3, 7) else collections.OrderedDict
 
-@six.add_metaclass(abc.ABCMeta)
-class Special(object):
+# Sentinel for distinguishing missing keys from keys set to None
+_unset = object()
+
+# Cache of parsed variable values, bounded to _PARSE_CACHE_SIZE entries
+_PARSE_CACHE_SIZE = 256
+_parse_cache = {}
+
+
+def _split_items(value, sep):
+    """
+    Split the value of a list-like environment variable into its
+    items.  Since the same values are often parsed repeatedly, e.g.,
+    by specials bound to copies of an ``Environment``, the results
+    are cached.  The items are interned, since they are hashed when
+    used as members of a ``SpecialSet``, and the same items (e.g.,
+    "/usr/local/bin") tend to recur across variables.
+
+    :param str value: The string value to split.
+    :param str sep: The item separator.
+
+    :returns: The items.  An empty value has no items.
+    :rtype: ``tuple`` of ``str``
+    """
+
+    # An empty variable is an empty list, not a list of one empty item
+    if not value:
+        return ()
+
+    key = (value, sep)
+    items = _parse_cache.get(key)
+    if items is None:
+        items = tuple(map(sys.intern, value.split(sep)))
+        if len(_parse_cache) < _PARSE_CACHE_SIZE:
+            _parse_cache[key] = items
+
+    return items
+
+
+def _split_pairs(value, item_sep, key_sep):
+    """
+    Split the value of a dictionary-like environment variable into its
+    key-value pairs.  As with ``_split_items()``, the results are
+    cached, and the keys are interned; values are not.
+
+    :param str value: The string value to split.
+    :param str item_sep: The item separator.
+    :param str key_sep: The key-value separator.
+
+    :returns: The key-value pairs.  Note that keys not followed by the
+              key-value separator will have the value ``None``.  An
+              empty value has no pairs.
+    :rtype: ``tuple`` of ``tuple``
+    """
+
+    # An empty variable is an empty dictionary
+    if not value:
+        return ()
+
+    key = (value, item_sep, key_sep)
+    pairs = _parse_cache.get(key)
+    if pairs is None:
+        # Split and partition in comprehensions, rather than an
+        # explicit loop, to keep the per-item work in C
+        parts = [item.partition(key_sep) for item in value.split(item_sep)]
+        intern = sys.intern
+        pairs = tuple([
+            (intern(k), v if sep else None) for k, sep, v in parts
+        ])
+        if len(_parse_cache) < _PARSE_CACHE_SIZE:
+            _parse_cache[key] = pairs
+
+    return pairs
+
+
+def _join_pairs(pairs, item_sep, key_sep):
+    """
+    Join key-value pairs into the value of a dictionary-like
+    environment variable.  This is the inverse of ``_split_pairs()``.
+
+    :param pairs: The key-value pairs.  Keys with the value ``None``
+                  are emitted without the key-value separator.
+    :param str item_sep: The item separator.
+    :param str key_sep: The key-value separator.
+
+    :returns: The string value.
+    :rtype: ``str``
+    """
+
+    return item_sep.join([
+        str(k) if v is None else '%s%s%s' % (k, key_sep, v)
+        for k, v in pairs
+    ])
+
+
+@functools.lru_cache(maxsize=None)
+def _with_defaults(cls, **defaults):
+    """
+    Create a subclass of a special with alternate default separators.
+    The defaults are baked into the subclass as class attributes, so
+    constructing the special does not pass through an additional
+    wrapper function.  The subclasses are cached, so the same
+    defaults always produce the same factory.
+
+    :param cls: The special class.
+    :param defaults: The default separator class attributes to set.
+
+    :returns: The subclass.
+    """
+
+    return type(cls)(cls.__name__, (cls,), defaults)
+
+
+class Special(object, metaclass=abc.ABCMeta):
     """
     Abstract superclass for all ``Environment`` specials.  A "special"
     is an interpreter for special environment variables; for instance,
     a special may take the PATH environment variable and represent it
     as a list-like object.
+
+    A special may also be used as a context manager to batch several
+    modifications; within the ``with`` block, the environment variable
+    is not updated until the block exits.  For instance::
+
+        with env['PATH'] as path:
+            path.append('/opt/bin')
+            path.append('/opt/sbin')
     """
 
+    # Batching state; see __enter__()
+    _batch = 0
+    _dirty = False
+
+    # The last value written to the environment variable; see raw
+    _joined = None
+
+    # Set once the special has been deregistered; see _detach()
+    _detached = False
+
     @abc.abstractmethod
     def __init__(self, env, var):
         """
@@ -42,8 +176,9 @@ class Special(object):
                         special is bound to.
         """
 
+        # Intern the name, since it's used as a key on every update
         self._env = env
-        self._var = var
+        self._var = sys.intern(var) if type(var) is str else var
 
     @abc.abstractmethod
     def set(self, value):
@@ -58,6 +193,8 @@ class Special(object):
         :param value: The value to set.
         """
 
+        if not self._detached:
+            self._joined = value
         self._env._set(self._var, value)
 
     @abc.abstractmethod
@@ -70,18 +207,90 @@ class Special(object):
         environment by calling the superclass ``delete()`` method.
         """
 
+        self._dirty = False
+        self._joined = None
         self._env._delete(self._var)
 
+    def _detach(self):
+        """
+        Detach the special from the environment.  This is called by
+        ``stepmaker.Environment`` when the special is deregistered;
+        since the environment variable may then be written without
+        going through the special, the value the special last wrote
+        is forgotten, and ``raw`` always consults the environment.
+        """
+
+        self._detached = True
+        self._joined = None
+
+    def __enter__(self):
+        """
+        Begin a batch of modifications.  Until the matching
+        ``__exit__()``, modifications of the special are not written
+        back to the environment variable.  Batches may be nested.
+
+        :returns: The special.
+        """
+
+        self._batch += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        """
+        End a batch of modifications.  When the outermost batch ends,
+        the environment variable is updated if the special was
+        modified.
+
+        :param exc_type: The type of the exception, if one was raised.
+        :param exc_value: The exception, if one was raised.
+        :param exc_tb: The traceback of the exception, if one was
+                       raised.
+        """
+
+        self._batch -= 1
+        if not self._batch and self._dirty:
+            self._update()
+
+    def _update(self):
+        """
+        Update the value of the environment variable after the special
+        has been modified.  Within a batch, this just marks the special
+        as modified; otherwise, the ``_flush()`` method is called.
+        """
+
+        if self._batch:
+            self._dirty = True
+            return
+
+        self._dirty = False
+        self._flush()
+
+    def _flush(self):
+        """
+        Write the value of the special back to the environment
+        variable.  Specials that call ``_update()`` must implement
+        this method.
+        """
+
+        raise NotImplementedError()
+
     @property
     def raw(self):
         """
         Return the raw value of the underlying environment variable.
+        Once the special has written the variable, the value it wrote
+        is returned without consulting the environment, until the
+        special is deregistered.
         """
 
-        return self._env.get_raw(self._var)
+        joined = self._joined
+        if joined is None:
+            return self._env.get_raw(self._var)
+
+        return joined
 
 
-class SpecialList(Special, collections.MutableSequence):
+class SpecialList(Special, collections.abc.MutableSequence):
     """
     A special for list-like environment variables.  This splits the
     values on the system path separator (or, with the ``with_sep()``
@@ -89,6 +298,9 @@ class SpecialList(Special, collections.MutableSequence):
     list-like view of the environment variable.
     """
 
+    # Default item separator; see with_sep()
+    _sep_default = os.pathsep
+
     @classmethod
     def with_sep(cls, sep):
         """
@@ -99,13 +311,13 @@ class SpecialList(Special, collections.MutableSequence):
 
         :param str sep: The item separator to use.
 
-        :returns: A factory function suitable for registering with an
+        :returns: A factory suitable for registering with an
                   ``Environment`` instance.
         """
 
-        return functools.partial(cls, sep=sep)
+        return _with_defaults(cls, _sep_default=sep)
 
-    def __init__(self, env, var, sep=os.pathsep):
+    def __init__(self, env, var, sep=None):
         """
         Initialize a ``SpecialList`` instance.
 
@@ -114,18 +326,21 @@ class SpecialList(Special, collections.MutableSequence):
         :param str var: The name of the environment variable the
                         special is bound to.
         :param str sep: The item separator to use.  Defaults to the
-                        system path separator.
+                        system path separator, or the separator passed
+                        to ``with_sep()``.
         """
 
         # Initialize the superclass and store the separator
         super(SpecialList, self).__init__(env, var)
-        self._sep = sep
+        self._sep = self._sep_default if sep is None else sep
 
         # Try to interpret the current value
         try:
-            self._value = self.raw.split(self._sep)
+            self._joined = self.raw
+            self._value = list(_split_items(self._joined, self._sep))
         except KeyError:
             # Not set
+            self._joined = None
             self._value = []
 
     def __repr__(self):
@@ -158,6 +373,63 @@ class SpecialList(Special, collections.MutableSequence):
 
         return self._value[idx]
 
+    def __iter__(self):
+        """
+        Iterate over the items in the list.
+
+        :returns: An iterator over the items in the list.
+        """
+
+        return iter(self._value)
+
+    def __reversed__(self):
+        """
+        Iterate over the items in the list in reverse order.
+
+        :returns: A reverse iterator over the items in the list.
+        """
+
+        return reversed(self._value)
+
+    def __contains__(self, item):
+        """
+        Determine if an item is contained within the list.
+
+        :returns: A ``True`` value if the item is in the list,
+                  ``False`` otherwise.
+        """
+
+        return item in self._value
+
+    def index(self, value, *args):
+        """
+        Find the index of an item in the list.
+
+        :param str value: The item to search for.
+        :param args: Optional start and stop indexes to limit the
+                     search to.
+
+        :returns: The index of the first occurrence of the item.
+        :rtype: ``int``
+
+        :raises ValueError:
+            The item is not in the list.
+        """
+
+        return self._value.index(value, *args)
+
+    def count(self, value):
+        """
+        Count the occurrences of an item in the list.
+
+        :param str value: The item to count.
+
+        :returns: The number of occurrences of the item.
+        :rtype: ``int``
+        """
+
+        return self._value.count(value)
+
     def __setitem__(self, idx, value):
         """
         Set the value of a specified item.
@@ -168,6 +440,10 @@ class SpecialList(Special, collections.MutableSequence):
         :type value: ``str`` or ``list`` of ``str``
         """
 
+        # Skip the update if an item is set to its current value
+        if not isinstance(idx, slice) and self._value[idx] == value:
+            return
+
         self._value[idx] = value
         self._update()
 
@@ -182,7 +458,7 @@ class SpecialList(Special, collections.MutableSequence):
         del self._value[idx]
         self._update()
 
-    def _update(self):
+    def _flush(self):
         """
         Update the value of the environment variable.
         """
@@ -201,9 +477,9 @@ class SpecialList(Special, collections.MutableSequence):
         :param value: The value to set.
         """
 
-        if isinstance(value, six.string_types):
+        if isinstance(value, str):
             # Split strings
-            self._value = value.split(self._sep)
+            self._value = list(_split_items(value, self._sep))
         else:
             # Convert whatever it is to a list
             self._value = list(value)
@@ -230,11 +506,48 @@ class SpecialList(Special, collections.MutableSequence):
         :param str value: The value to insert.
         """
 
+        # Appending is common (e.g., building up PATH), and only needs
+        # the new value added to the end of the current string
+        if (idx >= len(self._value) and self._value and not self._batch and
+                self._joined is not None):
+            self._value.append(value)
+            super(SpecialList, self).set(self._joined + self._sep + value)
+            return
+
         self._value.insert(idx, value)
         self._update()
 
+    def extend(self, values):
+        """
+        Append several items to the list.  The environment variable is
+        updated only once.
+
+        :param values: The items to append.
+        """
+
+        # Iterating over ourself while appending would never terminate
+        if values is self:
+            values = list(values)
+
+        self._value.extend(values)
+        self._update()
+
+    def __iadd__(self, values):
+        """
+        Append several items to the list, in place.  The environment
+        variable is updated only once.
+
+        :param values: The items to append.
+
+        :returns: The ``SpecialList`` instance.
+        :rtype: ``SpecialList``
+        """
+
+        self.extend(values)
+        return self
+
 
-class SpecialSet(Special, collections.MutableSet):
+class SpecialSet(Special, collections.abc.MutableSet):
     """
     A special for set-like environment variables.  This splits the
     values on the system path separator (or, with the ``with_sep()``
@@ -242,6 +555,9 @@ class SpecialSet(Special, collections.MutableSet):
     set-like view of the environment variable.
     """
 
+    # Default item separator; see with_sep()
+    _sep_default = os.pathsep
+
     @classmethod
     def with_sep(cls, sep):
         """
@@ -252,13 +568,13 @@ class SpecialSet(Special, collections.MutableSet):
 
         :param str sep: The item separator to use.
 
-        :returns: A factory function suitable for registering with an
+        :returns: A factory suitable for registering with an
                   ``Environment`` instance.
         """
 
-        return functools.partial(cls, sep=sep)
+        return _with_defaults(cls, _sep_default=sep)
 
-    def __init__(self, env, var, sep=os.pathsep):
+    def __init__(self, env, var, sep=None):
         """
         Initialize a ``SpecialSet`` instance.
 
@@ -267,20 +583,26 @@ class SpecialSet(Special, collections.MutableSet):
         :param str var: The name of the environment variable the
                         special is bound to.
         :param str sep: The item separator to use.  Defaults to the
-                        system path separator.
+                        system path separator, or the separator passed
+                        to ``with_sep()``.
         """
 
         # Initialize the superclass and store the separator
         super(SpecialSet, self).__init__(env, var)
-        self._sep = sep
+        self._sep = self._sep_default if sep is None else sep
 
         # Try to interpret the current value
         try:
-            self._value = set(self.raw.split(self._sep))
+            self._value = set(_split_items(self.raw, self._sep))
         except KeyError:
             # Not set
             self._value = set()
 
+        # The environment variable lists the items in sorted order;
+        # maintain that order incrementally rather than re-sorting the
+        # whole set on every update
+        self._sorted = sorted(self._value)
+
     def __repr__(self):
         """
         Return a suitable representation of the value.
@@ -317,12 +639,12 @@ class SpecialSet(Special, collections.MutableSet):
 
         return item in self._value
 
-    def _update(self):
+    def _flush(self):
         """
         Update the value of the environment variable.
         """
 
-        super(SpecialSet, self).set(self._sep.join(sorted(self._value)))
+        super(SpecialSet, self).set(self._sep.join(self._sorted))
 
     def set(self, value):
         """
@@ -336,13 +658,14 @@ class SpecialSet(Special, collections.MutableSet):
         :param value: The value to set.
         """
 
-        if isinstance(value, six.string_types):
+        if isinstance(value, str):
             # Split strings
-            self._value = set(value.split(self._sep))
+            self._value = set(_split_items(value, self._sep))
         else:
             # Convert whatever it is to a set
             self._value = set(value)
 
+        self._sorted = sorted(self._value)
         self._update()
 
     def delete(self):
@@ -355,6 +678,7 @@ class SpecialSet(Special, collections.MutableSet):
         """
 
         self._value = set()
+        self._sorted = []
         super(SpecialSet, self).delete()
 
     def add(self, item):
@@ -364,7 +688,12 @@ class SpecialSet(Special, collections.MutableSet):
         :param str item: The item to add.
         """
 
+        # Nothing to do if the item is already present
+        if item in self._value:
+            return
+
         self._value.add(item)
+        bisect.insort(self._sorted, item)
         self._update()
 
     def discard(self, item):
@@ -374,11 +703,54 @@ class SpecialSet(Special, collections.MutableSet):
         :param str item: The item to discard.
         """
 
-        self._value.discard(item)
+        # Nothing to do if the item is not present
+        if item not in self._value:
+            return
+
+        self._value.remove(item)
+        del self._sorted[bisect.bisect_left(self._sorted, item)]
         self._update()
 
+    def __ior__(self, items):
+        """
+        Add several items to the set, in place.  The environment
+        variable is updated only once, and only if the set changed.
+
+        :param items: The items to add.
+
+        :returns: The ``SpecialSet`` instance.
+        :rtype: ``SpecialSet``
+        """
+
+        new = set(items).difference(self._value)
+        if new:
+            self._value |= new
+            self._sorted = sorted(self._value)
+            self._update()
+
+        return self
+
+    def __isub__(self, items):
+        """
+        Discard several items from the set, in place.  The environment
+        variable is updated only once, and only if the set changed.
+
+        :param items: The items to discard.
+
+        :returns: The ``SpecialSet`` instance.
+        :rtype: ``SpecialSet``
+        """
+
+        old = self._value.intersection(items)
+        if old:
+            self._value -= old
+            self._sorted = sorted(self._value)
+            self._update()
+
+        return self
+
 
-class SpecialDict(Special, collections.MutableMapping):
+class SpecialDict(Special, collections.abc.MutableMapping):
     """
     A special for dictionary-like environment variables.  This splits
     the values on the system path separator (or, with the
@@ -388,6 +760,10 @@ class SpecialDict(Special, collections.MutableMapping):
     dictionary-like view of the environment variable.
     """
 
+    # Default separators; see with_sep()
+    _item_sep_default = os.pathsep
+    _key_sep_default = '='
+
     @classmethod
     def with_sep(cls, item_sep=os.pathsep, key_sep='='):
         """
@@ -401,13 +777,15 @@ class SpecialDict(Special, collections.MutableMapping):
         :param str key_sep: The key-value separator to use.  Defaults
                             to '='.
 
-        :returns: A factory function suitable for registering with an
+        :returns: A factory suitable for registering with an
                   ``Environment`` instance.
         """
 
-        return functools.partial(cls, item_sep=item_sep, key_sep=key_sep)
+        return _with_defaults(
+            cls, _item_sep_default=item_sep, _key_sep_default=key_sep,
+        )
 
-    def __init__(self, env, var, item_sep=os.pathsep, key_sep='='):
+    def __init__(self, env, var, item_sep=None, key_sep=None):
         """
         Initialize a ``SpecialDict`` instance.
 
@@ -416,15 +794,19 @@ class SpecialDict(Special, collections.MutableMapping):
         :param str var: The name of the environment variable the
                         special is bound to.
         :param str item_sep: The item separator to use.  Defaults to
-                             the system path separator.
+                             the system path separator, or the item
+                             separator passed to ``with_sep()``.
         :param str key_sep: The key-value separator to use.  Defaults
-                            to '='.
+                            to '=', or the key-value separator passed
+                            to ``with_sep()``.
         """
 
         # Initialize the superclass and store the separators
         super(SpecialDict, self).__init__(env, var)
-        self._item_sep = item_sep
-        self._key_sep = key_sep
+        self._item_sep = (
+            self._item_sep_default if item_sep is None else item_sep
+        )
+        self._key_sep = self._key_sep_default if key_sep is None else key_sep
 
         # Try to interpret the current value
         try:
@@ -471,6 +853,30 @@ class SpecialDict(Special, collections.MutableMapping):
 
         return self._value[key]
 
+    def __contains__(self, key):
+        """
+        Determine if a key is contained within the dictionary.
+
+        :returns: A ``True`` value if the key is in the dictionary,
+                  ``False`` otherwise.
+        """
+
+        return key in self._value
+
+    def get(self, key, default=None):
+        """
+        Retrieve the value of a specified key, returning a default if
+        the key does not exist.
+
+        :param str key: The key to retrieve.
+        :param default: The value to return if the key does not
+                        exist.  Defaults to ``None``.
+
+        :returns: The value of the specified key, or ``default``.
+        """
+
+        return self._value.get(key, default)
+
     def __setitem__(self, key, value):
         """
         Sets the value of a specified key.
@@ -479,6 +885,10 @@ class SpecialDict(Special, collections.MutableMapping):
         :param str value: The value to set the key to.
         """
 
+        # Skip the update if the key is set to its current value
+        if self._value.get(key, _unset) == value:
+            return
+
         self._value[key] = value
         self._update()
 
@@ -492,21 +902,15 @@ class SpecialDict(Special, collections.MutableMapping):
         del self._value[key]
         self._update()
 
-    def _update(self):
+    def _flush(self):
         """
         Update the value of the environment variable.
         """
 
-        super(SpecialDict, self).set(
-            self._item_sep.join(
-                '%s%s%s' % (
-                    key,
-                    '' if value is None else self._key_sep,
-                    '' if value is None else value
-                ) for key, value in
-                sorted(self._value.items(), key=lambda x: x[0])
-            )
-        )
+        # Keys are unique, so sorting the items sorts by key
+        super(SpecialDict, self).set(_join_pairs(
+            sorted(self._value.items()), self._item_sep, self._key_sep,
+        ))
 
     def _split(self, value):
         """
@@ -520,11 +924,7 @@ class SpecialDict(Special, collections.MutableMapping):
         :rtype: ``dict`` mapping ``str`` to ``str`` or ``None``
         """
 
-        result = {}
-        for item in value.split(self._item_sep):
-            key, sep, value = item.partition(self._key_sep)
-            result[key] = value if sep else None
-        return result
+        return dict(_split_pairs(value, self._item_sep, self._key_sep))
 
     def set(self, value):
         """
@@ -538,7 +938,7 @@ class SpecialDict(Special, collections.MutableMapping):
         :param value: The value to set.
         """
 
-        if isinstance(value, six.string_types):
+        if isinstance(value, str):
             # Split strings
             self._value = self._split(value)
         else:
@@ -560,7 +960,7 @@ class SpecialDict(Special, collections.MutableMapping):
         super(SpecialDict, self).delete()
 
 
-class SpecialOrderedDict(Special, collections.MutableMapping):
+class SpecialOrderedDict(Special, collections.abc.MutableMapping):
     """
     A special for OrderedDict-like environment variables.  This splits
     the values on the system path separator (or, with the
@@ -570,6 +970,10 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
     dictionary-like view of the environment variable.
     """
 
+    # Default separators; see with_sep()
+    _item_sep_default = os.pathsep
+    _key_sep_default = '='
+
     @classmethod
     def with_sep(cls, item_sep=os.pathsep, key_sep='='):
         """
@@ -584,13 +988,15 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
         :param str key_sep: The key-value separator to use.  Defaults
                             to '='.
 
-        :returns: A factory function suitable for registering with an
+        :returns: A factory suitable for registering with an
                   ``Environment`` instance.
         """
 
-        return functools.partial(cls, item_sep=item_sep, key_sep=key_sep)
+        return _with_defaults(
+            cls, _item_sep_default=item_sep, _key_sep_default=key_sep,
+        )
 
-    def __init__(self, env, var, item_sep=os.pathsep, key_sep='='):
+    def __init__(self, env, var, item_sep=None, key_sep=None):
         """
         Initialize a ``SpecialOrderedDict`` instance.
 
@@ -599,22 +1005,26 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
         :param str var: The name of the environment variable the
                         special is bound to.
         :param str item_sep: The item separator to use.  Defaults to
-                             the system path separator.
+                             the system path separator, or the item
+                             separator passed to ``with_sep()``.
         :param str key_sep: The key-value separator to use.  Defaults
-                            to '='.
+                            to '=', or the key-value separator passed
+                            to ``with_sep()``.
         """
 
         # Initialize the superclass and store the separators
         super(SpecialOrderedDict, self).__init__(env, var)
-        self._item_sep = item_sep
-        self._key_sep = key_sep
+        self._item_sep = (
+            self._item_sep_default if item_sep is None else item_sep
+        )
+        self._key_sep = self._key_sep_default if key_sep is None else key_sep
 
         # Try to interpret the current value
         try:
             self._value = self._split(self.raw)
         except KeyError:
             # Not set
-            self._value = collections.OrderedDict()
+            self._value = _OrderedDict()
 
     def __repr__(self):
         """
@@ -654,6 +1064,30 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
 
         return self._value[key]
 
+    def __contains__(self, key):
+        """
+        Determine if a key is contained within the dictionary.
+
+        :returns: A ``True`` value if the key is in the dictionary,
+                  ``False`` otherwise.
+        """
+
+        return key in self._value
+
+    def get(self, key, default=None):
+        """
+        Retrieve the value of a specified key, returning a default if
+        the key does not exist.
+
+        :param str key: The key to retrieve.
+        :param default: The value to return if the key does not
+                        exist.  Defaults to ``None``.
+
+        :returns: The value of the specified key, or ``default``.
+        """
+
+        return self._value.get(key, default)
+
     def __setitem__(self, key, value):
         """
         Sets the value of a specified key.
@@ -662,6 +1096,10 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
         :param str value: The value to set the key to.
         """
 
+        # Skip the update if the key is set to its current value
+        if self._value.get(key, _unset) == value:
+            return
+
         self._value[key] = value
         self._update()
 
@@ -675,20 +1113,14 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
         del self._value[key]
         self._update()
 
-    def _update(self):
+    def _flush(self):
         """
         Update the value of the environment variable.
         """
 
-        super(SpecialOrderedDict, self).set(
-            self._item_sep.join(
-                '%s%s%s' % (
-                    key,
-                    '' if value is None else self._key_sep,
-                    '' if value is None else value
-                ) for key, value in self._value.items()
-            )
-        )
+        super(SpecialOrderedDict, self).set(_join_pairs(
+            self._value.items(), self._item_sep, self._key_sep,
+        ))
 
     def _split(self, value):
         """
@@ -702,11 +1134,9 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
         :rtype: ``dict`` mapping ``str`` to ``str`` or ``None``
         """
 
-        result = collections.OrderedDict()
-        for item in value.split(self._item_sep):
-            key, sep, value = item.partition(self._key_sep)
-            result[key] = value if sep else None
-        return result
+        return _OrderedDict(
+            _split_pairs(value, self._item_sep, self._key_sep)
+        )
 
     def set(self, value):
         """
@@ -720,14 +1150,12 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
         :param value: The value to set.
         """
 
-        if isinstance(value, six.string_types):
+        if isinstance(value, str):
             # Split strings
             self._value = self._split(value)
-        elif isinstance(value, collections.OrderedDict):
-            self._value = value.copy()
         else:
-            # Convert whatever it is to an OrderedDict
-            self._value = collections.OrderedDict(value)
+            # Convert whatever it is to an ordered dictionary
+            self._value = _OrderedDict(value)
 
         self._update()
 
@@ -740,5 +1168,5 @@ class SpecialOrderedDict(Special, collections.MutableMapping):
         environment by calling the superclass ``delete()`` method.
         """
 
-        self._value = collections.OrderedDict()
+        self._value = _OrderedDict()
         super(SpecialOrderedDict, self).delete()
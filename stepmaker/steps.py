@@ -16,19 +16,29 @@ import abc
 import sys
 
 import entrypointer
-import six
 
 from stepmaker import exceptions
 from stepmaker import utils
 
 
-@six.add_metaclass(abc.ABCMeta)
-class StepItem(object):
+# Tags for the entries in Step._dispatch
+_ACTION = 0
+_MODIFIER = 1
+
+# Bound on the number of entries in the per-class caches of Step
+_CLASS_CACHE_SIZE = 256
+
+
+class StepItem(object, metaclass=abc.ABCMeta):
     """
     A superclass for all actions and modifiers.  This contains common
     pieces, such as config validation.
     """
 
+    # Subclasses that add no attributes of their own may declare
+    # empty __slots__ to avoid a per-instance __dict__
+    __slots__ = ('name', 'config', 'addr')
+
     def __init__(self, name, config, addr):
         """
         Initialize the action or modifier.  This should process and store
@@ -91,6 +101,8 @@ class Action(StepItem):
     ``False``.
     """
 
+    __slots__ = ()
+
     # Set to true to indicate an "eager" action
     eager = False
 
@@ -144,8 +156,7 @@ class ModifierMeta(abc.ABCMeta):
         return super(ModifierMeta, mcs).__new__(mcs, name, bases, namespace)
 
 
-@six.add_metaclass(ModifierMeta)
-class Modifier(StepItem):
+class Modifier(StepItem, metaclass=ModifierMeta):
     """
     A step *modifier*.  Modifiers modify a step in some fashion, such
     as through looping through a set of values for a step, or applying
@@ -170,8 +181,8 @@ class Modifier(StepItem):
     classes--that is, if class A has ``before`` set to
     ``set(["m1"])``, and class B extends class A but has ``before``
     set to ``set(["m2"])`` in its definition, the actual value of
-    ``before`` for the constructed class B will be set to ``set(["m1",
-    "m2"])``.
+    ``before`` for the constructed class B will be set to
+    ``frozenset(["m1", "m2"])``.
 
     Modifiers can also specify that they must be used--or *must not*
     be used--with another modifier.  These restrictions are expressed
@@ -184,6 +195,8 @@ class Modifier(StepItem):
     action.
     """
 
+    __slots__ = ()
+
     # Constants for the restriction attribute
     LAZY = 0x01
     EAGER = 0x02
@@ -296,41 +309,89 @@ class StepMeta(abc.ABCMeta):
         utils._inherit_set(['metadata_keys'], bases, namespace)
 
         # Construct the class
-        return super(StepMeta, mcs).__new__(mcs, name, bases, namespace)
+        cls = super(StepMeta, mcs).__new__(mcs, name, bases, namespace)
+
+        # Each class gets its own dispatch table and caches
+        cls._dispatch = {}
+        cls._sort_cache = {}
+        cls._compat_cache = set()
+
+        # Resolve the entrypoint groups once per class.  Abstract
+        # classes still have the abstract properties here, so only
+        # resolve namespaces that are actually strings; this also
+        # keeps the entrypoint groups separate across multiple Step
+        # subclasses.
+        ns_acts = getattr(cls, 'namespace_actions', None)
+        if isinstance(ns_acts, str):
+            cls._group_acts = getattr(entrypointer.eps, ns_acts)
+        ns_mods = getattr(cls, 'namespace_modifiers', None)
+        if isinstance(ns_mods, str):
+            cls._group_mods = getattr(entrypointer.eps, ns_mods)
+
+        return cls
 
 
 class ExceptionResult(object):
     """
     A wrapper for exceptions raised while processing a step.  The
-    ``exc_info`` attribute contains the tuple of exception
-    information, which may also be accessed using the ``type_``,
-    ``value``, and ``traceback`` attributes.  The exception may be
-    re-raised by calling the ``reraise()`` method.
+    ``value`` attribute contains the exception itself; its type and
+    traceback may be accessed using the ``type_`` and ``traceback``
+    attributes, and the ``exc_info`` attribute provides all three as
+    a tuple, in the form returned by ``sys.exc_info()``.  The
+    exception may be re-raised by calling the ``reraise()`` method.
     """
 
-    def __init__(self, exc_info):
+    __slots__ = ('value',)
+
+    def __init__(self, exc):
         """
         Initialize the ``ExceptionResult`` instance.
 
-        :param exc_info: A tuple of exception information, as returned
-                         by ``sys.exc_info()``.
+        :param exc: The exception.  For compatibility, a tuple of
+                    exception information, as returned by
+                    ``sys.exc_info()``, is also accepted.
+        :type exc: ``BaseException``
+        """
+
+        if isinstance(exc, tuple):
+            exc = exc[1]
+
+        self.value = exc
+
+    @property
+    def type_(self):
+        """
+        The type of the exception.
+        """
+
+        return type(self.value)
+
+    @property
+    def traceback(self):
+        """
+        The traceback of the exception.
+        """
+
+        return self.value.__traceback__
+
+    @property
+    def exc_info(self):
+        """
+        A tuple of exception information, in the form returned by
+        ``sys.exc_info()``.
         """
 
-        self.exc_info = exc_info
-        self.type_ = exc_info[0]
-        self.value = exc_info[1]
-        self.traceback = exc_info[2]
+        return (type(self.value), self.value, self.value.__traceback__)
 
     def reraise(self):
         """
         Re-raise the wrapped exception.
         """
 
-        six.reraise(*self.exc_info)
+        raise self.value.with_traceback(self.value.__traceback__)
 
 
-@six.add_metaclass(StepMeta)
-class Step(object):
+class Step(object, metaclass=StepMeta):
     """
     Represent a single step.  This class packages together step
     metadata, an action, and any modifiers into a single object, which
@@ -342,7 +403,7 @@ class Step(object):
     ``metadata_keys`` set to ``set(["mk1"])``, and class B extends
     class A but has ``metadata_keys`` set to ``set(["mk2"])`` in its
     definition, the actual value of ``metadata_keys`` for the
-    constructed class B will be set to ``set(["mk1", "mk2"])``.
+    constructed class B will be set to ``frozenset(["mk1", "mk2"])``.
 
     Actions and modifiers are discovered using entrypoints; the
     entrypoint groups are specified by the ``namespace_actions`` and
@@ -356,10 +417,13 @@ class Step(object):
     be distinct, in order to keep actions and modifiers separate.
     """
 
+    __slots__ = ('action', 'addr', 'modifiers', 'metadata')
+
     # Keys constituting metadata
     metadata_keys = set()
 
-    @abc.abstractproperty
+    @property
+    @abc.abstractmethod
     def namespace_actions(self):
         """
         The namespace to use to discover available actions.
@@ -367,7 +431,8 @@ class Step(object):
 
         pass  # pragma: no cover
 
-    @abc.abstractproperty
+    @property
+    @abc.abstractmethod
     def namespace_modifiers(self):
         """
         The namespace to use to discover available modifiers.
@@ -375,7 +440,8 @@ class Step(object):
 
         pass  # pragma: no cover
 
-    # Caches for the namespaces
+    # Entrypoint groups for the namespaces; resolved by StepMeta
+    # when a subclass sets the namespace class attributes
     _group_acts = None
     _group_mods = None
 
@@ -406,12 +472,6 @@ class Step(object):
             configuration error has been detected.
         """
 
-        # Grab the _group_acts class attribute.  Using hasattr() keeps
-        # the entrypoint group separate across multiple Step
-        # subclasses.
-        if cls._group_acts is None:
-            cls._group_acts = getattr(entrypointer.eps, cls.namespace_actions)
-
         # Get the action class
         action_cls = cls._group_acts[name]
 
@@ -427,42 +487,137 @@ class Step(object):
         return action_cls(name, value, addr.key(name))
 
     @classmethod
-    def _get_modifier(cls, name, value, addr, modifiers):
+    def _lookup(cls, name):
         """
-        Helper for ``parse()`` to resolve a modifier.
+        Helper for ``parse()`` to resolve a name to an action or
+        modifier class.  Actions take precedence over modifiers of the
+        same name.  Resolved names are remembered in the ``_dispatch``
+        class attribute, so each name is only looked up in the
+        entrypoint groups once per class.
 
-        :paramstr name: The name of the modifier to resolve.
-        :param value: The configuration value to pass on to the
-                      modifier.
+        :param str name: The name of the action or modifier to
+                         resolve.
+
+        :returns: A tuple of the tag (``_ACTION`` or ``_MODIFIER``)
+                  and the action or modifier class, or ``None`` if
+                  there is no action or modifier with the given
+                  ``name``.
+        :rtype: ``tuple``
+        """
+
+        entry = cls._dispatch.get(name)
+        if entry is None:
+            for tag, group in ((_ACTION, cls._group_acts),
+                               (_MODIFIER, cls._group_mods)):
+                klass = group.get(name)
+                if klass is not None:
+                    entry = cls._dispatch[name] = (tag, klass)
+                    break
+
+        return entry
+
+    @classmethod
+    def _sort_modifiers(cls, modifiers):
+        """
+        Helper for ``parse()`` to sort the modifiers into application
+        order.  The order depends only on which modifiers are present,
+        so the sorted names are remembered in the ``_sort_cache``
+        class attribute, keyed by the set of modifier names.
+
+        :param modifiers: A dictionary mapping modifier names to
+                          modifiers.
+        :type modifiers: ``dict`` mapping ``str`` to ``Modifier``
+
+        :returns: A list of modifiers in the proper order.
+        :rtype: ``list`` of ``Modifier``
+        """
+
+        # Nothing to sort
+        if not modifiers:
+            return []
+
+        key = frozenset(modifiers)
+        order = cls._sort_cache.get(key)
+        if order is None:
+            # Cache the dictionary keys, since those are what the
+            # result is built from; don't rely on the modifier names
+            keys = {id(mod): name for name, mod in modifiers.items()}
+            order = tuple(
+                keys[id(mod)] for mod in utils._sort_modifiers(modifiers)
+            )
+            if len(cls._sort_cache) < _CLASS_CACHE_SIZE:
+                cls._sort_cache[key] = order
+
+        return [modifiers[name] for name in order]
+
+    @classmethod
+    def _check_modifiers(cls, action, modifiers, addr):
+        """
+        Helper for ``parse()`` to check that the modifiers are
+        compatible with the action and with each other.  Compatibility
+        depends only on which modifiers are present and on whether the
+        action is "eager", so compatible combinations are remembered
+        in the ``_compat_cache`` class attribute.
+
+        :param action: The step action.
+        :type action: ``Action``
+        :param modifiers: A dictionary mapping modifier names to
+                          modifiers.
+        :type modifiers: ``dict`` mapping ``str`` to ``Modifier``
         :param addr: The address of the step.  This is to be used when
                      raising errors to help users determine which step
                      reported the error.
         :type addr: ``stepmaker.StepAddress``
-        :param modifiers: A dictionary of modifiers.  This dictionary
-                          will be updated with the new modifier
-                          instance.
-        :type modifiers: ``dict`` mapping ``str`` to ``Modifier``
-
-        :raises KeyError:
-            A modifier with the given ``name`` does not exist.
 
         :raises stepmaker.StepError:
-            Some configuration error has been detected.
+            The modifiers are not compatible.
         """
 
-        # Grab the _group_mods class attribute.  Using hasattr() keeps
-        # the entrypoint group separate across multiple Step
-        # subclasses.
-        if cls._group_mods is None:
-            cls._group_mods = getattr(
-                entrypointer.eps, cls.namespace_modifiers
-            )
+        # Need to know the type of action and the modifier set
+        action_type = Modifier.EAGER if action.eager else Modifier.LAZY
+        modifier_set = frozenset(modifiers)
 
-        # Get the modifier class
-        modifier_cls = cls._group_mods[name]
+        # Skip combinations already known to be compatible
+        key = (modifier_set, action_type)
+        if key in cls._compat_cache:
+            return
 
-        # Add it to the modifiers dictionary
-        modifiers[name] = modifier_cls(name, value, addr.key(name))
+        for modifier in modifiers.values():
+            # First, check for compatibility with the action
+            if not (modifier.restriction & action_type):
+                raise exceptions.StepError(
+                    'Modifier "%s" is incompatible with action "%s"' %
+                    (modifier.name, action.name),
+                    addr,
+                )
+
+            # Now check that prohibited modifiers aren't present; most
+            # modifiers have no cross dependencies, so skip the set
+            # operations when the sets are empty
+            if modifier.prohibited:
+                prohibited = modifier_set & modifier.prohibited
+                if prohibited:
+                    raise exceptions.StepError(
+                        'Modifier "%s" cannot be used with modifier(s): '
+                        '"%s"' %
+                        (modifier.name, '", "'.join(sorted(prohibited))),
+                        addr,
+                    )
+
+            # How about required modifiers?
+            if modifier.required:
+                required = modifier.required - modifier_set
+                if required:
+                    raise exceptions.StepError(
+                        'Modifier "%s" requires the use of modifier(s): '
+                        '"%s"' %
+                        (modifier.name, '", "'.join(sorted(required))),
+                        addr,
+                    )
+
+        # Remember the compatible combination
+        if len(cls._compat_cache) < _CLASS_CACHE_SIZE:
+            cls._compat_cache.add(key)
 
     @classmethod
     def parse(cls, description, addr):
@@ -485,7 +640,7 @@ class Step(object):
         """
 
         # Begin by normalizing the description
-        if isinstance(description, six.string_types):
+        if isinstance(description, str):
             # Short-circuit the dictionary processing logic
             return cls(cls._get_action(description, None, addr), addr)
 
@@ -495,67 +650,49 @@ class Step(object):
         action = None
         modifiers = {}
         for key, value in description.items():
+            # Descriptions typically come from YAML or JSON, so the
+            # same keys recur as distinct strings; interning them
+            # shares one copy among all the steps and speeds up the
+            # lookups below
+            if type(key) is str:
+                key = sys.intern(key)
+
             # Handle metadata first
             if key in cls.metadata_keys:
                 metadata[key] = value
                 continue
 
-            # OK, let's see if it's an action
-            try:
-                action = cls._get_action(key, value, addr, action)
-            except KeyError:
-                pass
-            else:
-                # This gets optimized out
-                continue  # pragma: no cover
-
-            # OK, must be a modifier
-            try:
-                cls._get_modifier(key, value, addr, modifiers)
-            except KeyError:
+            # Is it an action or a modifier?
+            entry = cls._lookup(key)
+            if entry is None:
                 raise exceptions.StepError(
                     'Unknown action or modifier "%s"' % key,
                     addr,
                 )
+            tag, klass = entry
 
-        # Make sure we have an action
-        if action is None:
-            raise exceptions.StepError('No action specified', addr)
-
-        # Need to know the type of action and the modifier set
-        action_type = Modifier.EAGER if action.eager else Modifier.LAZY
-        modifier_set = set(modifiers)
-
-        # Check that the modifiers are compatible
-        for name, modifier in modifiers.items():
-            # First, check for compatibility with the action
-            if modifier.restriction & action_type == 0:
+            if tag == _MODIFIER:
+                modifiers[key] = klass(key, value, addr.key(key))
+            elif action is not None:
+                # Only one action is allowed
                 raise exceptions.StepError(
-                    'Modifier "%s" is incompatible with action "%s"' %
-                    (modifier.name, action.name),
+                    'Multiple actions "%s" and "%s" specified in step' %
+                    (key, action.name),
                     addr,
                 )
+            else:
+                action = klass(key, value, addr.key(key))
 
-            # Now check that prohibited modifiers aren't present
-            prohibited = modifier_set & modifier.prohibited
-            if prohibited:
-                raise exceptions.StepError(
-                    'Modifier "%s" cannot be used with modifier(s): "%s"' %
-                    (modifier.name, '", "'.join(sorted(prohibited))),
-                    addr,
-                )
+        # Make sure we have an action
+        if action is None:
+            raise exceptions.StepError('No action specified', addr)
 
-            # How about required modifiers?
-            required = modifier.required - modifier_set
-            if required:
-                raise exceptions.StepError(
-                    'Modifier "%s" requires the use of modifier(s): "%s"' %
-                    (modifier.name, '", "'.join(sorted(required))),
-                    addr,
-                )
+        # Check that the modifiers are compatible
+        if modifiers:
+            cls._check_modifiers(action, modifiers, addr)
 
         # Construct the step
-        return cls(action, addr, utils._sort_modifiers(modifiers), metadata)
+        return cls(action, addr, cls._sort_modifiers(modifiers), metadata)
 
     @classmethod
     def parse_list(cls, ctxt, description, addr):
@@ -672,30 +809,43 @@ class Step(object):
         :returns: The result of evaluating the modifiers and action.
         """
 
+        # Fast path for steps without modifiers to apply
+        if not post_call:
+            try:
+                return action(self, ctxt)
+            except Exception as exc:
+                return ExceptionResult(exc)
+
+        # The modifiers applied so far; the hooks are passed copies,
+        # so a single slice builds each list
+        applied = list(pre_call)
+        base = len(applied)
+
         # Begin by walking the modifier list
         i = -1
         try:
-            for i in range(len(post_call)):
-                post_call[i].pre_call(
+            for i, modifier in enumerate(post_call):
+                modifier.pre_call(
                     self,
                     ctxt,
-                    pre_call + post_call[:i],
+                    applied[:],
                     post_call[i + 1:],
                     action,
                 )
+                applied.append(modifier)
         except exceptions.AbortStep as exc:
             # Step aborted
             result = exc.result
-        except Exception:
+        except Exception as exc:
             # An exception occurred while processing
-            result = ExceptionResult(sys.exc_info())
+            result = ExceptionResult(exc)
         else:
             try:
                 # Call the action
                 result = action(self, ctxt)
-            except Exception:
+            except Exception as exc:
                 # An exception occurred while processing
-                result = ExceptionResult(sys.exc_info())
+                result = ExceptionResult(exc)
 
         # We've now evaluated all the pre_call's and the action, or
         # been aborted somewhere; now to call all the post_call hooks
@@ -707,11 +857,11 @@ class Step(object):
                     result,
                     action,
                     post_call[j + 1:],
-                    pre_call + post_call[:j],
+                    applied[:base + j],
                 )
-            except Exception:
+            except Exception as exc:
                 # An exception occurred while processing
-                result = ExceptionResult(sys.exc_info())
+                result = ExceptionResult(exc)
 
         # Return the result of evaluation
         return result
@@ -12,15 +12,36 @@
 # implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
-import collections
-import contextlib
+import collections.abc
 import os
 
-import six
-
 from stepmaker import exceptions
 
 
+if os.name == 'posix':
+    def _isabs(path):
+        """
+        Determine if a path is absolute.  On POSIX systems, a string
+        path is absolute if it begins with a "/"; checking that
+        directly avoids the path-like coercion performed by
+        ``os.path.isabs()``, which is used for all other paths.
+
+        :param path: The path to check.
+        :type path: ``str``, ``bytes``, or path-like object
+
+        :returns: A ``True`` value if the path is absolute, ``False``
+                  otherwise.
+        :rtype: ``bool``
+        """
+
+        if type(path) is str:
+            return path.startswith('/')
+
+        return os.path.isabs(path)
+else:  # pragma: no cover
+    _isabs = os.path.isabs
+
+
 def _canonicalize_path(cwd, path):
     """
     Canonicalizes a path relative to a given working directory.  That
@@ -34,10 +55,8 @@ def _canonicalize_path(cwd, path):
     :rtype: ``str``
     """
 
-    if not os.path.isabs(path):
-        path = os.path.join(cwd, path)
-
-    return os.path.abspath(path)
+    # os.path.join() discards cwd if path is already absolute
+    return os.path.abspath(os.path.join(cwd, path))
 
 
 def _inherit_set(attrs, bases, namespace):
@@ -46,7 +65,8 @@ def _inherit_set(attrs, bases, namespace):
     from ``set`` attributes in a class; e.g., if a class declaration
     has an attribute set to ``set(['a', 'b'])``, and a superclass has
     the same attribute set to ``set(['b', 'c'])``, the final class
-    will have that attribute set to ``set(['a', 'b', 'c'])``.
+    will have that attribute set to ``frozenset(['a', 'b', 'c'])``.
+    The merged sets are frozen, since they are only ever read.
 
     :param attrs: A list of attribute names.
     :type attrs: ``list`` of ``str``
@@ -57,18 +77,11 @@ def _inherit_set(attrs, bases, namespace):
     """
 
     for attr in attrs:
-        # Get the attribute value from the class namespace
-        result = set(namespace.get(attr, []))
-
-        # Add the results from all the base classes
-        for base in bases:
-            result |= getattr(base, attr, set())
-
-        # Update the value in the namespace
-        namespace[attr] = result
-
-
-VisitQueueElem = collections.namedtuple('VisitQueueElem', ['mod', 'before'])
+        # Merge the attribute value from the class namespace with the
+        # values from all the base classes
+        namespace[attr] = frozenset(namespace.get(attr, ())).union(
+            *[getattr(base, attr, ()) for base in bases]
+        )
 
 
 def _sort_visit(adjacency, result, node):
@@ -78,36 +91,29 @@ def _sort_visit(adjacency, result, node):
     ``_sort_modifiers()``.
 
     :param adjacency: The adjacency dictionary assembled by
-                      ``_sort_modifiers()``.
+                      ``_sort_modifiers()``.  The "before" entry of
+                      each node must be sorted in reverse order.
     :param result: The result list to add modifiers to.
     :type result: ``list`` of ``stepmaker.Modifier``
     :param node: A node popped off the adjacency dictionary.
     """
 
-    # Work queue
-    queue = [
-        VisitQueueElem(
-            node['mod'],
-            iter(sorted(node['before'], reverse=True)),
-        ),
-    ]
+    # Work queue of (modifier, iterator over its before list) tuples
+    queue = [(node['mod'], iter(node['before']))]
+    pop = adjacency.pop
 
     # While there's work in the queue...
     while queue:
         try:
-            # Get the next node that should be before this one
-            vname = six.next(queue[-1].before)
-            if vname in adjacency:
-                # Pop that node off the adjacency list and add it to
-                # the queue
-                nextnode = adjacency.pop(vname)
-                queue.append(VisitQueueElem(
-                    nextnode['mod'],
-                    iter(sorted(nextnode['before'], reverse=True)),
-                ))
+            # Get the next node that should be before this one; if it
+            # is still in the adjacency list, pop it off and add it to
+            # the queue
+            nextnode = pop(next(queue[-1][1]), None)
+            if nextnode is not None:
+                queue.append((nextnode['mod'], iter(nextnode['before'])))
         except StopIteration:
             # Explored all its dependencies, add it to the results
-            result.append(queue.pop().mod)
+            result.append(queue.pop()[0])
 
 
 def _sort_modifiers(modifiers):
@@ -123,26 +129,29 @@ def _sort_modifiers(modifiers):
     :rtype: ``list`` of ``Modifier``
     """
 
+    # Nothing to order with fewer than two modifiers
+    if len(modifiers) < 2:
+        return list(modifiers.values())
+
     # First, build an adjacency map reduced to the set of nodes we
-    # actually have
-    adjacency = collections.defaultdict(lambda: {'before': set()})
+    # actually have, starting from each modifier's before list;
+    # intersecting with the keys view yields a new, mutable set
+    names = modifiers.keys()
+    adjacency = {
+        name: {'mod': modifier, 'before': names & modifier.before}
+        for name, modifier in modifiers.items()
+    }
+
+    # Now process the modifiers' after lists
     for name, modifier in modifiers.items():
-        # Store the modifier
-        adjacency[name]['mod'] = modifier
-
-        # Include the modifier's before list
-        adjacency[name]['before'] |= {
-            oname for oname in modifier.before if oname in modifiers
-        }
-
-        # Now process the modifier's after list
-        for oname in modifier.after:
-            if oname not in modifiers:
-                # Not one in the set of modifiers
-                continue
-
+        for oname in names & modifier.after:
             adjacency[oname]['before'].add(name)
 
+    # Sort each node's before set once, in the order the visitor
+    # explores it
+    for node in adjacency.values():
+        node['before'] = sorted(node['before'], reverse=True)
+
     # Construct the result list and call our visitor
     result = []
     for vname in sorted(adjacency, reverse=True):
@@ -155,40 +164,72 @@ def _sort_modifiers(modifiers):
     return result
 
 
-@contextlib.contextmanager
-def jsonschema_validator(addr):
+class jsonschema_validator(object):
     """
     Helper for configuration validation using the ``jsonschema``
-    package.  This function is a context manager that is passed the
-    root address; if a ``jsonschema.ValidationError`` is raised by the
+    package.  This is a context manager that is passed the root
+    address; if a ``jsonschema.ValidationError`` is raised by the
     encompassed code, it will be translated into a
     ``stepmaker.StepError`` exception with the proper address.  This
-    function is written such that no direct dependency on the
-    ``jsonschema`` package is created.
+    helper is written such that no direct dependency on the
+    ``jsonschema`` package is created.  It is implemented as a class,
+    rather than with ``contextlib.contextmanager``, so that entering
+    and leaving the context on the common, error-free path does not
+    need to drive a generator.
+    """
 
-    :param addr: The address of the configuration being validated.
-    :type addr: ``stepmaker.StepAddress``
+    __slots__ = ('addr',)
 
-    :returns: A context manager.
-    """
+    def __init__(self, addr):
+        """
+        Initialize the ``jsonschema_validator`` context manager.
+
+        :param addr: The address of the configuration being
+                     validated.
+        :type addr: ``stepmaker.StepAddress``
+        """
+
+        self.addr = addr
+
+    def __enter__(self):
+        """
+        Enter the context manager.
+
+        :returns: ``None``.
+        """
+
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        """
+        Exit the context manager.  Validation errors are translated
+        into ``stepmaker.StepError``; any other exception is allowed
+        to propagate.
+
+        :param exc_type: The type of the exception raised, if any.
+        :param exc: The exception raised, if any.
+        :param tb: The traceback of the exception, if any.
+
+        :returns: ``False``, to allow any other exception to
+                  propagate.
+        """
 
-    try:
-        yield
-    except Exception as exc:
         # Differentiate ValidationError by looking for a path
         # attribute with a sequence in it
-        if (not hasattr(exc, 'path') or
-                not isinstance(exc.path, collections.Sequence)):
-            raise
+        if (not isinstance(exc, Exception) or
+                not hasattr(exc, 'path') or
+                not isinstance(exc.path, collections.abc.Sequence)):
+            return False
 
         # OK, it has a path; assemble the path string fragment
-        path = ''.join(
-            ('/%s' if isinstance(elem, six.string_types) else '[%d]') % elem
+        path = ''.join([
+            '/%s' % elem if isinstance(elem, str) else '[%d]' % elem
             for elem in exc.path
-        )
+        ])
 
         # Raise it as a StepError
+        addr = self.addr
         raise exceptions.StepError(
-            six.text_type(exc),
+            str(exc),
             addr.__class__(addr.filename, addr.path + path),
         )
@@ -1,5 +1,3 @@
-import six
-
 from stepmaker import addresses
 
 
@@ -9,27 +7,41 @@ class TestStepAddress(object):
 
         assert result.filename == 'filename'
         assert result.path == ''
+        assert result._segments == ()
+        assert result._str is None
 
     def test_init_alt(self):
         result = addresses.StepAddress('filename', '/some/path')
 
         assert result.filename == 'filename'
         assert result.path == '/some/path'
+        assert result._segments == ('/some/path',)
+        assert result._str is None
 
     def test_str(self):
         obj = addresses.StepAddress('filename', '/some/path')
 
-        assert six.text_type(obj) == 'filename:/some/path'
+        assert str(obj) == 'filename:/some/path'
+        assert obj._str == 'filename:/some/path'
+
+    def test_str_cached(self):
+        obj = addresses.StepAddress('filename', '/some/path')
+        obj._str = 'cached'
+
+        assert str(obj) == 'cached'
 
     def test_key(self):
         obj = addresses.StepAddress('filename', '/some/path')
 
         result = obj.key('spam')
 
+        assert result._path is None
+        assert result._str is None
         assert id(obj) != id(result)
         assert obj.path == '/some/path'
         assert result.filename == obj.filename
         assert result.path == '/some/path/spam'
+        assert result._segments == ('/some/path', '/spam')
 
     def test_idx(self):
         obj = addresses.StepAddress('filename', '/some/path')
@@ -40,3 +52,21 @@ class TestStepAddress(object):
         assert obj.path == '/some/path'
         assert result.filename == obj.filename
         assert result.path == '/some/path[42]'
+        assert result._segments == ('/some/path', '[42]')
+
+    def test_key_subclass(self):
+        class StepAddressForTest(addresses.StepAddress):
+            __slots__ = ()
+
+        obj = StepAddressForTest('filename', '/some/path')
+
+        result = obj.idx(42)
+
+        assert isinstance(result, StepAddressForTest)
+        assert str(result) == 'filename:/some/path[42]'
+
+    def test_path_cached(self):
+        obj = addresses.StepAddress('filename', '/some/path')
+        obj._path = 'cached'
+
+        assert obj.path == 'cached'
@@ -1,16 +1,87 @@
+import builtins
 import os
+import pathlib
 
 import pytest
-from six.moves import builtins
 
 from stepmaker import environment
 from stepmaker import exceptions
+from stepmaker import specials
 
 
 class ExceptionForTest(Exception):
     pass
 
 
+class TestIntern(object):
+    def test_str(self):
+        name = ''.join(['TEST', '_', 'VAR'])
+
+        result = environment._intern(name)
+
+        assert result == 'TEST_VAR'
+        assert result is environment._intern('TEST_VAR')
+
+    def test_other(self):
+        name = ('TEST', 'VAR')
+
+        result = environment._intern(name)
+
+        assert result is name
+
+
+class TestSplitArgs(object):
+    def test_list(self, mocker):
+        mocker.patch.dict(environment._split_cache, clear=True)
+        mock_split = mocker.patch.object(environment.shlex, 'split')
+        args = ['cmd', 'a1', 'a2']
+
+        result = environment._split_args(args)
+
+        assert result is args
+        assert environment._split_cache == {}
+        mock_split.assert_not_called()
+
+    def test_str_uncached(self, mocker):
+        mocker.patch.dict(environment._split_cache, clear=True)
+        mock_split = mocker.patch.object(
+            environment.shlex, 'split',
+            return_value=['cmd', 'a1', 'a2'],
+        )
+
+        result = environment._split_args('cmd a1 a2')
+
+        assert result == ['cmd', 'a1', 'a2']
+        assert environment._split_cache == {
+            'cmd a1 a2': ('cmd', 'a1', 'a2'),
+        }
+        mock_split.assert_called_once_with('cmd a1 a2')
+
+    def test_str_cached(self, mocker):
+        mocker.patch.dict(environment._split_cache, clear=True)
+        environment._split_cache['cmd a1 a2'] = ('cmd', 'b1', 'b2')
+        mock_split = mocker.patch.object(environment.shlex, 'split')
+
+        result = environment._split_args('cmd a1 a2')
+
+        assert result == ['cmd', 'b1', 'b2']
+        mock_split.assert_not_called()
+
+    def test_str_cache_full(self, mocker):
+        mocker.patch.dict(environment._split_cache, clear=True)
+        mocker.patch.object(environment, '_SPLIT_CACHE_SIZE', 0)
+        mock_split = mocker.patch.object(
+            environment.shlex, 'split',
+            return_value=['cmd', 'a1', 'a2'],
+        )
+
+        result = environment._split_args('cmd a1 a2')
+
+        assert result == ['cmd', 'a1', 'a2']
+        assert environment._split_cache == {}
+        mock_split.assert_called_once_with('cmd a1 a2')
+
+
 class TestCompletedProcess(object):
     def test_init_base(self):
         result = environment.CompletedProcess(['a1', 'a2', 'a3'], 42)
@@ -49,12 +120,18 @@ class TestEnvironment(object):
         assert result._cwd == '/real/path'
         assert result._specials == {}
         assert result._special_cache == {}
+        assert result._popen_defaults == {
+            'env': result._environ,
+            'close_fds': True,
+        }
+        assert result._popen_defaults['env'] is result._environ
+        assert result._filename_cache == {}
         mock_canonicalize_path.assert_called_once_with(
             '/some/path', os.curdir,
         )
 
     def test_init_alt(self, mocker):
-        mocker.patch.object(
+        mock_getcwd = mocker.patch.object(
             environment.os, 'getcwd',
             return_value='/some/path',
         )
@@ -63,15 +140,33 @@ class TestEnvironment(object):
             return_value='/real/path',
         )
 
-        result = environment.Environment({'a': 1, 'b': 2}, '/c/w/d', c=3, d=4)
+        result = environment.Environment(
+            {'a': 1, 'b': 2}, '/c/w/../d', c=3, d=4,
+        )
 
         assert result._environ == {'a': 1, 'b': 2}
         assert id(result._environ) != id(os.environ)
-        assert result._cwd == '/real/path'
+        assert result._cwd == '/c/d'
         assert result._specials == {'c': 3, 'd': 4}
         assert result._special_cache == {}
+        mock_getcwd.assert_not_called()
+        mock_canonicalize_path.assert_not_called()
+
+    def test_init_relative_cwd(self, mocker):
+        mocker.patch.object(
+            environment.os, 'getcwd',
+            return_value='/some/path',
+        )
+        mock_canonicalize_path = mocker.patch.object(
+            environment.utils, '_canonicalize_path',
+            return_value='/real/path',
+        )
+
+        result = environment.Environment({'a': 1, 'b': 2}, 'c/w/d')
+
+        assert result._cwd == '/real/path'
         mock_canonicalize_path.assert_called_once_with(
-            '/some/path', '/c/w/d',
+            '/some/path', 'c/w/d',
         )
 
     def test_len(self):
@@ -86,6 +181,12 @@ class TestEnvironment(object):
 
         assert result == set(['a', 'b'])
 
+    def test_contains(self):
+        obj = environment.Environment({'a': 1, 'b': 2})
+
+        assert 'a' in obj
+        assert 'c' not in obj
+
     def test_getitem_missing_key(self, mocker):
         mock_get_special = mocker.patch.object(
             environment.Environment, '_get_special',
@@ -125,9 +226,11 @@ class TestEnvironment(object):
         )
         obj = environment.Environment({'a': 1, 'b': 2})
 
-        obj['a'] = 5
+        obj[''.join(['a', 'c'])] = 5
 
-        assert obj._environ == {'a': 5, 'b': 2}
+        assert obj._environ == {'a': 1, 'ac': 5, 'b': 2}
+        name = [k for k in obj._environ if k == 'ac'][0]
+        assert name is environment._intern('ac')
         mock_get_special.assert_not_called()
         special.set.assert_not_called()
 
@@ -173,6 +276,20 @@ class TestEnvironment(object):
         mock_get_special.assert_not_called()
         special.delete.assert_not_called()
 
+    def test_delitem_missing_key_with_special(self, mocker):
+        special = mocker.Mock()
+        mock_get_special = mocker.patch.object(
+            environment.Environment, '_get_special',
+            return_value=special,
+        )
+        obj = environment.Environment({'a': 1, 'b': 2}, c='special')
+
+        with pytest.raises(KeyError):
+            del obj['c']
+        assert obj._environ == {'a': 1, 'b': 2}
+        mock_get_special.assert_not_called()
+        special.delete.assert_not_called()
+
     def test_delitem_with_special(self, mocker):
         special = mocker.Mock()
         mock_get_special = mocker.patch.object(
@@ -284,6 +401,40 @@ class TestEnvironment(object):
         mock_system.assert_not_called()
         assert len(process.method_calls) == 0
 
+    def test_call_positional_input_and_check(self, mocker):
+        mock_system = mocker.patch.object(
+            environment.Environment, '_system',
+        )
+        obj = environment.Environment()
+
+        with pytest.raises(TypeError):
+            obj(['cmd', 'a1', 'a2'], 'text')
+        with pytest.raises(TypeError):
+            obj(['cmd', 'a1', 'a2'], None, True)
+        mock_system.assert_not_called()
+
+    def test_call_none_input_and_stdin(self, mocker):
+        process = mocker.Mock(**{
+            'communicate.return_value': ('stdout', 'stderr'),
+            'poll.return_value': 0,
+        })
+        mock_system = mocker.patch.object(
+            environment.Environment, '_system',
+            return_value=process,
+        )
+        obj = environment.Environment()
+
+        result = obj(['cmd', 'a1', 'a2'], input=None, stdin='pipe')
+
+        assert result.returncode == 0
+        mock_system.assert_called_once_with(
+            ['cmd', 'a1', 'a2'], {'stdin': 'pipe'},
+        )
+        process.assert_has_calls([
+            mocker.call.communicate(None),
+            mocker.call.poll(),
+        ])
+
     def test_call_communicate_fail(self, mocker):
         process = mocker.Mock(**{
             'communicate.side_effect': ExceptionForTest('test'),
@@ -442,15 +593,22 @@ class TestEnvironment(object):
         )
         obj = environment.Environment({'a': 1, 'b': 2})
 
-        result = obj._system('args', {
+        kwargs = {
             'c': 3,
             'd': 4,
             'cwd': '/other/path',
             'env': {'a': 2, 'b': 1},
             'close_fds': False
-        })
+        }
+
+        result = obj._system('args', kwargs)
 
         assert result == 'result'
+        assert kwargs['cwd'] == '/other/path'
+        assert obj._popen_defaults == {
+            'env': {'a': 1, 'b': 2},
+            'close_fds': True,
+        }
         mock_filename.assert_called_once_with('/other/path')
         mock_Popen.assert_called_once_with(
             'args',
@@ -461,6 +619,111 @@ class TestEnvironment(object):
             close_fds=False,
         )
 
+    def test_get_base(self, mocker):
+        mock_get_special = mocker.patch.object(
+            environment.Environment, '_get_special',
+            return_value='special',
+        )
+        obj = environment.Environment({'a': 1, 'b': 2})
+
+        assert obj.get('a') == 1
+        assert obj.get('c') is None
+        assert obj.get('c', 'default') == 'default'
+        mock_get_special.assert_not_called()
+
+    def test_get_with_special(self, mocker):
+        mock_get_special = mocker.patch.object(
+            environment.Environment, '_get_special',
+            return_value='special',
+        )
+        obj = environment.Environment({'a': 1, 'b': 2}, a='spam')
+
+        assert obj.get('a') == 'special'
+        mock_get_special.assert_called_once_with('a')
+
+    def test_get_with_special_missing_key(self, mocker):
+        mock_get_special = mocker.patch.object(
+            environment.Environment, '_get_special',
+            return_value='special',
+        )
+        obj = environment.Environment({'a': 1, 'b': 2}, c='spam')
+
+        assert obj.get('c', 'default') == 'default'
+        mock_get_special.assert_not_called()
+
+    def test_keys(self):
+        obj = environment.Environment({'a': 1, 'b': 2}, a='spam')
+
+        result = obj.keys()
+
+        assert set(result) == set(['a', 'b'])
+
+    def test_items_base(self, mocker):
+        mock_get_special = mocker.patch.object(
+            environment.Environment, '_get_special',
+            return_value='special',
+        )
+        obj = environment.Environment({'a': 1, 'b': 2})
+
+        result = obj.items()
+
+        assert isinstance(result, environment._ItemsView)
+        assert set(result) == set([('a', 1), ('b', 2)])
+        mock_get_special.assert_not_called()
+
+    def test_items_with_special(self, mocker):
+        mock_get_special = mocker.patch.object(
+            environment.Environment, '_get_special',
+            return_value='special',
+        )
+        obj = environment.Environment({'a': 1, 'b': 2}, a='spam')
+
+        result = obj.items()
+
+        assert set(result) == set([('a', 'special'), ('b', 2)])
+        mock_get_special.assert_called_once_with('a')
+
+    def test_items_special_registered_later(self):
+        obj = environment.Environment({'a': 1, 'b': 2})
+        result = obj.items()
+
+        obj.register('a', lambda env, var: 'special')
+
+        assert set(result) == set([('a', 'special'), ('b', 2)])
+
+    def test_values_base(self, mocker):
+        mock_get_special = mocker.patch.object(
+            environment.Environment, '_get_special',
+            return_value='special',
+        )
+        obj = environment.Environment({'a': 1, 'b': 2})
+
+        result = obj.values()
+
+        assert isinstance(result, environment._ValuesView)
+        assert sorted(result) == [1, 2]
+        mock_get_special.assert_not_called()
+
+    def test_values_with_special(self, mocker):
+        mock_get_special = mocker.patch.object(
+            environment.Environment, '_get_special',
+            return_value='special',
+        )
+        obj = environment.Environment({'a': 1, 'b': 2}, a='spam')
+
+        result = obj.values()
+
+        assert sorted(result, key=str) == [2, 'special']
+        mock_get_special.assert_called_once_with('a')
+
+    def test_values_special_registered_later(self):
+        obj = environment.Environment({'a': 1, 'b': 2})
+        result = obj.values()
+
+        obj.register('a', lambda env, var: 'special')
+
+        assert sorted(result, key=str) == [2, 'special']
+
     def test_setdefault_missing(self, mocker):
         obj = environment.Environment({'a': 1, 'b': 2})
 
@@ -487,7 +750,32 @@ class TestEnvironment(object):
         assert id(result._environ) != id(obj._environ)
         assert result._cwd == '/c/w/d'
         assert result._specials == {'c': 3, 'd': 4}
+        assert id(result._specials) != id(obj._specials)
         assert result._special_cache == {}
+        assert result._popen_defaults['env'] is result._environ
+        assert result._popen_defaults['close_fds'] is True
+        assert result._filename_cache == obj._filename_cache
+        assert id(result._filename_cache) != id(obj._filename_cache)
+
+    def test_copy_empty(self, mocker):
+        mock_init = mocker.patch.object(
+            environment.Environment, '__init__',
+            return_value=None,
+        )
+        obj = environment.Environment.__new__(environment.Environment)
+        obj._environ = {}
+        obj._cwd = '/c/w/d'
+        obj._specials = {}
+        obj._special_cache = {'a': 'cached'}
+        obj._filename_cache = {}
+
+        result = obj.copy()
+
+        assert result._environ == {}
+        assert result._cwd == '/c/w/d'
+        assert result._specials == {}
+        assert result._special_cache == {}
+        mock_init.assert_not_called()
 
     def test_register_base(self):
         obj = environment.Environment({'a': 1, 'b': 2}, c=3, d=4)
@@ -519,6 +807,29 @@ class TestEnvironment(object):
         assert obj._specials == {'d': 4}
         assert obj._special_cache == {}
 
+    def test_register_detach(self, mocker):
+        special = mocker.Mock()
+        obj = environment.Environment({'a': 1, 'b': 2}, c=3, d=4)
+        obj._special_cache['c'] = special
+
+        result = obj.register('c')
+
+        assert result == 3
+        assert obj._special_cache == {}
+        special._detach.assert_called_once_with()
+
+    def test_register_detach_raw(self):
+        obj = environment.Environment(
+            {'PATH': 'a:b'}, PATH=specials.SpecialList,
+        )
+        path = obj['PATH']
+        path.append('c')
+
+        obj.register('PATH')
+        obj['PATH'] = 'x'
+
+        assert path.raw == 'x'
+
     def test_get_raw_missing_key_no_default(self, mocker):
         obj = environment.Environment({'a': 1, 'b': 2}, c='special')
 
@@ -550,8 +861,66 @@ class TestEnvironment(object):
         result = obj.filename('file.name')
 
         assert result == '/canon/path'
+        assert obj._filename_cache == {'file.name': '/canon/path'}
         mock_canonicalize_path.assert_called_once_with(obj._cwd, 'file.name')
 
+    def test_filename_pathlike(self, mocker):
+        obj = environment.Environment()
+        # Note: must be set up after initializing the environment
+        mock_canonicalize_path = mocker.patch.object(
+            environment.utils, '_canonicalize_path',
+            return_value='/canon/path',
+        )
+
+        result = obj.filename(pathlib.PurePosixPath('some/file.name'))
+
+        assert result == '/canon/path'
+        mock_canonicalize_path.assert_called_once_with(
+            obj._cwd, 'some/file.name',
+        )
+
+    def test_filename_cached(self, mocker):
+        obj = environment.Environment()
+        obj._filename_cache['file.name'] = '/cached/path'
+        # Note: must be set up after initializing the environment
+        mock_canonicalize_path = mocker.patch.object(
+            environment.utils, '_canonicalize_path',
+            return_value='/canon/path',
+        )
+
+        result = obj.filename('file.name')
+
+        assert result == '/cached/path'
+        mock_canonicalize_path.assert_not_called()
+
+    def test_filename_cache_full(self, mocker):
+        mocker.patch.object(environment, '_FILENAME_CACHE_SIZE', 0)
+        obj = environment.Environment()
+        # Note: must be set up after initializing the environment
+        mock_canonicalize_path = mocker.patch.object(
+            environment.utils, '_canonicalize_path',
+            return_value='/canon/path',
+        )
+
+        result = obj.filename('file.name')
+
+        assert result == '/canon/path'
+        assert obj._filename_cache == {}
+        mock_canonicalize_path.assert_called_once_with(obj._cwd, 'file.name')
+
+    def test_filename_absolute(self, mocker):
+        obj = environment.Environment()
+        # Note: must be set up after initializing the environment
+        mock_canonicalize_path = mocker.patch.object(
+            environment.utils, '_canonicalize_path',
+            return_value='/canon/path',
+        )
+
+        result = obj.filename('/some/../file.name')
+
+        assert result == '/file.name'
+        mock_canonicalize_path.assert_not_called()
+
     def test_open_base(self, mocker):
         mock_open = mocker.patch.object(
             builtins, 'open',
@@ -625,8 +994,10 @@ class TestEnvironment(object):
             return_value='/new/cwd',
         )
         obj = environment.Environment()
+        obj._filename_cache['file.name'] = '/cached/path'
 
         obj.cwd = '/some/path'
 
         assert obj._cwd == '/new/cwd'
+        assert obj._filename_cache == {}
         mock_filename.assert_called_once_with('/some/path')
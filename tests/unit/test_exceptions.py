@@ -1,22 +1,66 @@
+import copy
+import pickle
 import signal
 
-import six
-
 from stepmaker import environment
 from stepmaker import exceptions
 
 
+class TestSignalNames(object):
+    def test_signal_names(self):
+        assert exceptions._SIGNAL_NAMES[signal.SIGINT] == 'SIGINT'
+        assert exceptions._SIGNAL_NAMES[signal.SIGTERM] == 'SIGTERM'
+        assert 'SIG_DFL' not in exceptions._SIGNAL_NAMES.values()
+
+
+class TestSigname(object):
+    def test_known(self):
+        assert exceptions._signame(signal.SIGINT) == 'SIGINT'
+
+    def test_unknown(self):
+        assert exceptions._signame(1000) == 'unknown signal 1000'
+
+    def test_cached(self, mocker):
+        exceptions._signame.cache_clear()
+        mock_Signals = mocker.patch.object(
+            exceptions.signal, 'Signals',
+            return_value=mocker.Mock(),
+        )
+        mock_Signals.return_value.name = 'SIGSPAM'
+
+        assert exceptions._signame(42) == 'SIGSPAM'
+        assert exceptions._signame(42) == 'SIGSPAM'
+        mock_Signals.assert_called_once_with(42)
+        exceptions._signame.cache_clear()
+
+
 class TestStepError(object):
     def test_init_base(self):
         result = exceptions.StepError('some message')
 
-        assert six.text_type(result) == 'some message'
+        assert str(result) == 'some message'
         assert result.addr is None
 
     def test_init_alt(self):
         result = exceptions.StepError('some message', 'addr')
 
-        assert six.text_type(result) == 'some message (addr)'
+        assert str(result) == 'some message (addr)'
+        assert result.addr == 'addr'
+
+    def test_copy(self):
+        exc = exceptions.StepError('some message', 'addr')
+
+        result = copy.copy(exc)
+
+        assert str(result) == 'some message (addr)'
+        assert result.addr == 'addr'
+
+    def test_pickle(self):
+        exc = exceptions.StepError('some message', 'addr')
+
+        result = pickle.loads(pickle.dumps(exc))
+
+        assert str(result) == 'some message (addr)'
         assert result.addr == 'addr'
 
 
@@ -31,6 +75,27 @@ class TestAbortStep(object):
 
         assert result.result == 'result'
 
+    def test_copy(self):
+        exc = exceptions.AbortStep('result')
+
+        result = copy.copy(exc)
+
+        assert result.result == 'result'
+
+    def test_copy_skipped(self):
+        exc = exceptions.AbortStep()
+
+        result = copy.copy(exc)
+
+        assert result.result is exceptions.skipped
+
+    def test_pickle(self):
+        exc = exceptions.AbortStep('result')
+
+        result = pickle.loads(pickle.dumps(exc))
+
+        assert result.result == 'result'
+
 
 class TestProcessError(object):
     def test_init_signal(self):
@@ -38,7 +103,7 @@ class TestProcessError(object):
 
         result = exceptions.ProcessError(res)
 
-        assert six.text_type(result) == 'Command "cmd" died with SIGINT'
+        assert str(result) == 'Command "cmd" died with SIGINT'
         assert result.result == res
 
     def test_init_unknown_signal(self):
@@ -46,7 +111,7 @@ class TestProcessError(object):
 
         result = exceptions.ProcessError(res)
 
-        assert (six.text_type(result) ==
+        assert (str(result) ==
                 'Command "cmd" died with unknown signal 1000')
         assert result.result == res
 
@@ -55,7 +120,7 @@ class TestProcessError(object):
 
         result = exceptions.ProcessError(res)
 
-        assert (six.text_type(result) ==
+        assert (str(result) ==
                 'Command "cmd" returned non-zero exit status 42')
         assert result.result == res
 
@@ -64,5 +129,24 @@ class TestProcessError(object):
 
         result = exceptions.ProcessError(res)
 
-        assert six.text_type(result) == 'Command "cmd" successful'
+        assert str(result) == 'Command "cmd" successful'
         assert result.result == res
+
+    def test_copy(self):
+        res = environment.CompletedProcess(['cmd', 'a1', 'a2'], 42)
+        exc = exceptions.ProcessError(res)
+
+        result = copy.copy(exc)
+
+        assert str(result) == str(exc)
+        assert result.result is res
+
+    def test_pickle(self):
+        res = environment.CompletedProcess(['cmd', 'a1', 'a2'], 42)
+        exc = exceptions.ProcessError(res)
+
+        result = pickle.loads(pickle.dumps(exc))
+
+        assert str(result) == str(exc)
+        assert result.result.args == ['cmd', 'a1', 'a2']
+        assert result.result.returncode == 42
@@ -1,5 +1,7 @@
+import collections.abc
+import copy
+
 import pytest
-import six
 
 from stepmaker import redaction
 
@@ -15,10 +17,29 @@ class TestRedacted(object):
 
         assert result.text == 'text'
 
+    def test_init_interned(self):
+        text = ''.join(['re', 'dacted'])
+
+        result = redaction.Redacted(text)
+
+        assert result.text is redaction.sys.intern('redacted')
+
     def test_str(self):
         obj = redaction.Redacted()
 
-        assert six.text_type(obj) == '<redacted>'
+        assert str(obj) == '<redacted>'
+
+    def test_repr(self):
+        obj = redaction.Redacted()
+
+        assert repr(obj) == '<redacted>'
+
+    def test_identity(self):
+        obj = redaction.Redacted()
+
+        assert obj == obj
+        assert obj != redaction.Redacted()
+        assert hash(obj) == object.__hash__(obj)
 
 
 class TestRedactedObject(object):
@@ -26,15 +47,24 @@ class TestRedactedObject(object):
         result = redaction.RedactedObject('obj')
 
         assert result.__redacted_obj__ == 'obj'
-        assert result.__redacted_attrs__ == set()
+        assert result.__redacted_attrs__ is redaction._EMPTY
         assert result.__redacted__ is redaction.redacted
+        assert result.__redacted_strict__ is True
 
     def test_init_alt(self):
-        result = redaction.RedactedObject('obj', 'attrs', 'redact')
+        result = redaction.RedactedObject('obj', 'attrs', 'redact', False)
 
         assert result.__redacted_obj__ == 'obj'
         assert result.__redacted_attrs__ == 'attrs'
         assert result.__redacted__ == 'redact'
+        assert result.__redacted_strict__ is False
+
+    def test_init_empty_set(self):
+        attrs = set()
+
+        result = redaction.RedactedObject('obj', attrs)
+
+        assert result.__redacted_attrs__ is attrs
 
     def test_getattr_base(self, mocker):
         base = mocker.Mock(a=1)
@@ -48,6 +78,20 @@ class TestRedactedObject(object):
 
         assert obj.a is redaction.redacted
 
+    def test_getattr_empty(self, mocker):
+        base = mocker.Mock(a=1)
+        attrs = mocker.MagicMock(**{'__bool__.return_value': False})
+        obj = redaction.RedactedObject(base, attrs)
+
+        assert obj.a == 1
+        attrs.__contains__.assert_not_called()
+
+    def test_getattr_inverter(self, mocker):
+        base = mocker.Mock(a=1)
+        obj = redaction.RedactedObject(base, redaction.Inverter(set()))
+
+        assert obj.a is redaction.redacted
+
     def test_getattr_missing(self, mocker):
         base = mocker.Mock(spec_set=[])
         obj = redaction.RedactedObject(base, set(['a']))
@@ -55,13 +99,40 @@ class TestRedactedObject(object):
         with pytest.raises(AttributeError):
             obj.a
 
+    def test_getattr_nonstrict(self, mocker):
+        base = mocker.Mock(spec_set=[])
+        obj = redaction.RedactedObject(base, set(['a']), strict=False)
+
+        assert obj.a is redaction.redacted
+
+    def test_slots(self):
+        obj = redaction.RedactedObject('obj')
+
+        with pytest.raises(AttributeError):
+            object.__getattribute__(obj, '__dict__')
+
+    def test_getattr_uninitialized(self):
+        obj = redaction.RedactedObject.__new__(redaction.RedactedObject)
+
+        with pytest.raises(AttributeError):
+            obj.a
+
+    def test_copy(self, mocker):
+        base = mocker.Mock(a=1)
+        obj = redaction.RedactedObject(base, set(['a']))
+
+        result = copy.copy(obj)
+
+        assert result.__redacted_obj__ is base
+        assert result.a is redaction.redacted
+
     def test_setattr_base(self, mocker):
         base = mocker.Mock(spec_set=['a'])
         obj = redaction.RedactedObject(base, set(['a']))
 
-        obj.__redacted_something__ = 42
+        obj.__redacted__ = 42
 
-        assert obj.__dict__['__redacted_something__'] == 42
+        assert object.__getattribute__(obj, '__redacted__') == 42
 
     def test_setattr_proxied(self, mocker):
         base = mocker.Mock(spec_set=['a'])
@@ -70,16 +141,15 @@ class TestRedactedObject(object):
         obj.a = 42
 
         assert base.a == 42
-        assert 'a' not in obj.__dict__
 
     def test_delattr_base(self, mocker):
         base = mocker.Mock(spec_set=['a'])
         obj = redaction.RedactedObject(base, set(['a']))
-        obj.__redacted_something__ = 42
 
-        del obj.__redacted_something__
+        del obj.__redacted__
 
-        assert '__redacted_something__' not in obj.__dict__
+        with pytest.raises(AttributeError):
+            object.__getattribute__(obj, '__redacted__')
 
     def test_delattr_proxied(self, mocker):
         base = mocker.Mock(a=42, spec_set=['a'])
@@ -88,7 +158,6 @@ class TestRedactedObject(object):
         del obj.a
 
         assert not hasattr(base, 'a')
-        assert 'a' not in obj.__dict__
 
 
 class TestRedactedDict(object):
@@ -100,8 +169,11 @@ class TestRedactedDict(object):
 
         result = redaction.RedactedDict('obj')
 
-        assert result.__redacted_keys__ == set()
-        mock_init.assert_called_once_with('obj', None, redaction.redacted)
+        assert result.__redacted_keys__ is redaction._EMPTY
+        assert result.__redacted_len__ is None
+        mock_init.assert_called_once_with(
+            'obj', None, redaction.redacted, True,
+        )
 
     def test_init_alt(self, mocker):
         mock_init = mocker.patch.object(
@@ -109,21 +181,49 @@ class TestRedactedDict(object):
             return_value=None,
         )
 
-        result = redaction.RedactedDict('obj', 'keys', 'attrs', 'redact')
+        result = redaction.RedactedDict(
+            'obj', 'keys', 'attrs', 'redact', False,
+        )
 
         assert result.__redacted_keys__ == 'keys'
-        mock_init.assert_called_once_with('obj', 'attrs', 'redact')
+        mock_init.assert_called_once_with('obj', 'attrs', 'redact', False)
+
+    def test_slots(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2})
+
+        with pytest.raises(AttributeError):
+            object.__getattribute__(obj, '__dict__')
+
+    def test_init_frozen(self):
+        result = redaction.RedactedDict({'a': 1, 'b': 2}, frozen=True)
+
+        assert result.__redacted_len__ == 2
 
     def test_len(self):
         obj = redaction.RedactedDict({'a': 1, 'b': 2})
 
         assert len(obj) == 2
 
+    def test_len_frozen(self):
+        base = {'a': 1, 'b': 2}
+        obj = redaction.RedactedDict(base, frozen=True)
+        base['c'] = 3
+
+        assert len(obj) == 2
+
     def test_iter(self):
         obj = redaction.RedactedDict({'a': 1, 'b': 2})
 
         assert set(obj) == set(['a', 'b'])
 
+    def test_getattr_class_precedence(self, mocker):
+        base = mocker.Mock(keys='proxied')
+        obj = redaction.RedactedDict(base, redacted_attrs=set(['keys']))
+
+        assert obj.keys == obj.keys
+        assert obj.keys != 'proxied'
+        assert obj.keys is not redaction.redacted
+
     def test_getitem_base(self):
         obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['b']))
 
@@ -134,12 +234,76 @@ class TestRedactedDict(object):
 
         assert obj['a'] is redaction.redacted
 
+    def test_getitem_empty(self, mocker):
+        keys = mocker.MagicMock(**{'__bool__.return_value': False})
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, keys)
+
+        assert obj['a'] == 1
+        keys.__contains__.assert_not_called()
+
     def test_getitem_missing(self):
         obj = redaction.RedactedDict({'b': 2}, set(['a']))
 
         with pytest.raises(KeyError):
             obj['a']
 
+    def test_getitem_nonstrict(self):
+        obj = redaction.RedactedDict({'b': 2}, set(['a']), strict=False)
+
+        assert obj['a'] is redaction.redacted
+
+    def test_contains(self, mocker):
+        mock_getitem = mocker.patch.object(
+            redaction.RedactedDict, '__getitem__',
+        )
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['a']))
+
+        assert 'a' in obj
+        assert 'b' in obj
+        assert 'c' not in obj
+        mock_getitem.assert_not_called()
+
+    def test_get_base(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['b']))
+
+        assert obj.get('a') == 1
+
+    def test_get_redacted(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['a']))
+
+        assert obj.get('a') is redaction.redacted
+
+    def test_get_missing(self):
+        obj = redaction.RedactedDict({'b': 2}, set(['a']))
+
+        assert obj.get('a') is None
+
+    def test_get_missing_default(self):
+        obj = redaction.RedactedDict({'b': 2}, set(['a']))
+
+        assert obj.get('a', 'default') == 'default'
+
+    def test_get_nonstrict(self):
+        obj = redaction.RedactedDict({'b': 2}, set(['a']), strict=False)
+
+        assert obj.get('a') is redaction.redacted
+
+    def test_items_redacted_base(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['a']))
+
+        result = obj.items_redacted()
+
+        assert sorted(result) == [('a', redaction.redacted), ('b', 2)]
+
+    def test_items_redacted_empty(self, mocker):
+        keys = mocker.MagicMock(**{'__bool__.return_value': False})
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, keys)
+
+        result = obj.items_redacted()
+
+        assert sorted(result) == [('a', 1), ('b', 2)]
+        keys.__contains__.assert_not_called()
+
     def test_setitem(self):
         base = {'a': 1, 'b': 2}
         obj = redaction.RedactedDict(base, set(['a']))
@@ -148,6 +312,15 @@ class TestRedactedDict(object):
 
         assert base == {'a': 5, 'b': 2}
 
+    def test_setitem_frozen(self):
+        base = {'a': 1, 'b': 2}
+        obj = redaction.RedactedDict(base, set(['a']), frozen=True)
+
+        with pytest.raises(TypeError):
+            obj['a'] = 5
+
+        assert base == {'a': 1, 'b': 2}
+
     def test_delitem(self):
         base = {'a': 1, 'b': 2}
         obj = redaction.RedactedDict(base, set(['a']))
@@ -156,16 +329,205 @@ class TestRedactedDict(object):
 
         assert base == {'b': 2}
 
+    def test_delitem_frozen(self):
+        base = {'a': 1, 'b': 2}
+        obj = redaction.RedactedDict(base, set(['a']), frozen=True)
+
+        with pytest.raises(TypeError):
+            del obj['a']
+
+        assert base == {'a': 1, 'b': 2}
+
+    def test_mutable_mapping(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2})
+
+        assert isinstance(obj, collections.abc.MutableMapping)
+        assert collections.abc.MutableMapping not in type(obj).__mro__
+
+    def test_unhashable(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2})
+
+        with pytest.raises(TypeError):
+            hash(obj)
+
+    def test_eq(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['a']))
+
+        assert obj == {'a': redaction.redacted, 'b': 2}
+        assert obj != {'a': 1, 'b': 2}
+        assert obj != 'other'
+
+    def test_keys(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['a']))
+
+        assert set(obj.keys()) == set(['a', 'b'])
+
+    def test_items(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['a']))
+
+        assert sorted(obj.items()) == [('a', redaction.redacted), ('b', 2)]
+
+    def test_values(self):
+        obj = redaction.RedactedDict({'a': 1, 'b': 2}, set(['a']))
+
+        result = list(obj.values())
+
+        assert len(result) == 2
+        assert redaction.redacted in result
+        assert 2 in result
+
+    def test_pop_base(self):
+        base = {'a': 1, 'b': 2}
+        obj = redaction.RedactedDict(base, set(['a']))
+
+        assert obj.pop('a') is redaction.redacted
+        assert obj.pop('b') == 2
+        assert base == {}
+
+    def test_pop_missing(self):
+        obj = redaction.RedactedDict({'b': 2}, set(['a']))
+
+        with pytest.raises(KeyError):
+            obj.pop('a')
+
+    def test_pop_missing_default(self):
+        obj = redaction.RedactedDict({'b': 2}, set(['a']))
+
+        assert obj.pop('a', None) is None
+
+    def test_pop_frozen(self):
+        base = {'a': 1, 'b': 2}
+        obj = redaction.RedactedDict(base, frozen=True)
+
+        with pytest.raises(TypeError):
+            obj.pop('a')
+
+        assert base == {'a': 1, 'b': 2}
+
+    def test_popitem_base(self):
+        base = {'a': 1}
+        obj = redaction.RedactedDict(base, set(['a']))
+
+        assert obj.popitem() == ('a', redaction.redacted)
+        assert base == {}
+
+    def test_popitem_empty(self):
+        obj = redaction.RedactedDict({})
+
+        with pytest.raises(KeyError):
+            obj.popitem()
+
+    def test_clear_base(self):
+        base = {'a': 1, 'b': 2}
+        obj = redaction.RedactedDict(base)
+
+        obj.clear()
+
+        assert base == {}
+
+    def test_clear_frozen(self):
+        base = {'a': 1, 'b': 2}
+        obj = redaction.RedactedDict(base, frozen=True)
+
+        with pytest.raises(TypeError):
+            obj.clear()
+
+        assert base == {'a': 1, 'b': 2}
+
+    def test_update_base(self):
+        base = {'a': 1}
+        obj = redaction.RedactedDict(base)
+
+        obj.update({'b': 2}, c=3)
+
+        assert base == {'a': 1, 'b': 2, 'c': 3}
+
+    def test_update_frozen(self):
+        base = {'a': 1}
+        obj = redaction.RedactedDict(base, frozen=True)
+
+        with pytest.raises(TypeError):
+            obj.update(b=2)
+
+        assert base == {'a': 1}
+
+    def test_setdefault_exists(self):
+        base = {'a': 1, 'b': 2}
+        obj = redaction.RedactedDict(base, set(['a']))
+
+        assert obj.setdefault('a', 5) is redaction.redacted
+        assert obj.setdefault('b', 5) == 2
+        assert base == {'a': 1, 'b': 2}
+
+    def test_setdefault_missing(self):
+        base = {'b': 2}
+        obj = redaction.RedactedDict(base)
+
+        assert obj.setdefault('a', 5) == 5
+        assert base == {'a': 5, 'b': 2}
+
 
 class TestInverter(object):
-    def test_init(self):
+    def test_init_set(self):
+        base = set(['a', 'b'])
+
+        result = redaction.Inverter(base)
+
+        assert result._base is base
+
+    def test_init_mapping(self):
+        base = {'a': 1, 'b': 2}
+
+        result = redaction.Inverter(base)
+
+        assert result._base is base
+
+    def test_init_sequence(self):
+        result = redaction.Inverter(['a', 'b'])
+
+        assert result._base == frozenset(['a', 'b'])
+        assert isinstance(result._base, frozenset)
+
+    def test_init_other(self):
         result = redaction.Inverter('base')
 
         assert result._base == 'base'
 
+    def test_init_inverter(self):
+        base = redaction.Inverter(set(['a']))
+
+        result = redaction.Inverter(base)
+
+        assert result._base is base
+        assert 'a' in result
+        assert 'b' not in result
+
     def test_contains(self):
         base = set(['a'])
         obj = redaction.Inverter(base)
 
         assert 'a' not in obj
         assert 'b' in obj
+
+    def test_materialize(self):
+        obj = redaction.Inverter(set(['a']))
+
+        result = obj.materialize(['a', 'b', 'c'])
+
+        assert result == frozenset(['b', 'c'])
+        assert isinstance(result, frozenset)
+
+    def test_materialize_mapping(self):
+        obj = redaction.Inverter({'a': 1})
+
+        result = obj.materialize(['a', 'b'])
+
+        assert result == frozenset(['b'])
+
+    def test_materialize_other(self):
+        obj = redaction.Inverter(redaction.Inverter(set(['a'])))
+
+        result = obj.materialize(['a', 'b', 'c'])
+
+        assert result == frozenset(['a'])
+        assert isinstance(result, frozenset)
@@ -1,6 +1,8 @@
 import collections
 import os
 
+import pytest
+
 from stepmaker import specials
 
 
@@ -15,6 +17,112 @@ class SpecialForTest(specials.Special):
         super(SpecialForTest, self).delete()
 
 
+class TestSplitItems(object):
+    def test_uncached(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+
+        result = specials._split_items('val:ue', ':')
+
+        assert result == ('val', 'ue')
+        assert specials._parse_cache == {('val:ue', ':'): ('val', 'ue')}
+
+    def test_interned(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+
+        result = specials._split_items(''.join(['val:', 'ue']), ':')
+
+        assert result[0] is specials.sys.intern('val')
+        assert result[1] is specials.sys.intern('ue')
+
+    def test_empty(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+
+        result = specials._split_items('', ':')
+
+        assert result == ()
+        assert specials._parse_cache == {}
+
+    def test_cached(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+        specials._parse_cache[('val:ue', ':')] = ('cached',)
+
+        result = specials._split_items('val:ue', ':')
+
+        assert result == ('cached',)
+
+    def test_cache_full(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+        mocker.patch.object(specials, '_PARSE_CACHE_SIZE', 0)
+
+        result = specials._split_items('val:ue', ':')
+
+        assert result == ('val', 'ue')
+        assert specials._parse_cache == {}
+
+
+class TestSplitPairs(object):
+    def test_uncached(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+
+        result = specials._split_pairs('a=1:b:c=', ':', '=')
+
+        assert result == (('a', '1'), ('b', None), ('c', ''))
+        assert specials._parse_cache == {
+            ('a=1:b:c=', ':', '='): (('a', '1'), ('b', None), ('c', '')),
+        }
+
+    def test_interned(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+
+        result = specials._split_pairs(''.join(['key=', 'value']), ':', '=')
+
+        assert result[0][0] is specials.sys.intern('key')
+
+    def test_empty(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+
+        result = specials._split_pairs('', ':', '=')
+
+        assert result == ()
+        assert specials._parse_cache == {}
+
+    def test_cached(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+        specials._parse_cache[('a=1', ':', '=')] = (('cached', None),)
+
+        result = specials._split_pairs('a=1', ':', '=')
+
+        assert result == (('cached', None),)
+
+    def test_cache_full(self, mocker):
+        mocker.patch.dict(specials._parse_cache, clear=True)
+        mocker.patch.object(specials, '_PARSE_CACHE_SIZE', 0)
+
+        result = specials._split_pairs('a=1', ':', '=')
+
+        assert result == (('a', '1'),)
+        assert specials._parse_cache == {}
+
+
+class TestJoinPairs(object):
+    def test_base(self):
+        result = specials._join_pairs(
+            [('a', '1'), ('b', None), ('c', '')], ':', '=',
+        )
+
+        assert result == 'a=1:b:c='
+
+    def test_nonstring(self):
+        result = specials._join_pairs([(1, 2), (3, None)], '|', '/')
+
+        assert result == '1/2|3'
+
+    def test_empty(self):
+        result = specials._join_pairs([], ':', '=')
+
+        assert result == ''
+
+
 class TestSpecial(object):
     def test_init(self):
         result = SpecialForTest('env', 'var')
@@ -22,22 +130,118 @@ class TestSpecial(object):
         assert result._env == 'env'
         assert result._var == 'var'
 
+    def test_init_interned(self):
+        var = ''.join(['v', 'ar'])
+
+        result = SpecialForTest('env', var)
+
+        assert result._var is specials.sys.intern('var')
+
     def test_set(self, mocker):
         env = mocker.Mock()
         obj = SpecialForTest(env, 'var')
 
         obj.set('value')
 
+        assert obj._joined == 'value'
+        env._set.assert_called_once_with('var', 'value')
+
+    def test_set_detached(self, mocker):
+        env = mocker.Mock()
+        obj = SpecialForTest(env, 'var')
+        obj._detached = True
+
+        obj.set('value')
+
+        assert obj._joined is None
         env._set.assert_called_once_with('var', 'value')
 
     def test_delete(self, mocker):
         env = mocker.Mock()
         obj = SpecialForTest(env, 'var')
 
+        obj._joined = 'value'
+
         obj.delete()
 
+        assert obj._joined is None
         env._delete.assert_called_once_with('var')
 
+    def test_delete_dirty(self, mocker):
+        env = mocker.Mock()
+        obj = SpecialForTest(env, 'var')
+        obj._dirty = True
+
+        obj.delete()
+
+        assert obj._dirty is False
+
+    def test_enter(self):
+        obj = SpecialForTest('env', 'var')
+
+        result = obj.__enter__()
+
+        assert result is obj
+        assert obj._batch == 1
+
+    def test_exit_nested(self, mocker):
+        mock_update = mocker.patch.object(SpecialForTest, '_update')
+        obj = SpecialForTest('env', 'var')
+        obj._batch = 2
+        obj._dirty = True
+
+        obj.__exit__(None, None, None)
+
+        assert obj._batch == 1
+        mock_update.assert_not_called()
+
+    def test_exit_clean(self, mocker):
+        mock_update = mocker.patch.object(SpecialForTest, '_update')
+        obj = SpecialForTest('env', 'var')
+        obj._batch = 1
+
+        obj.__exit__(None, None, None)
+
+        assert obj._batch == 0
+        mock_update.assert_not_called()
+
+    def test_exit_dirty(self, mocker):
+        mock_update = mocker.patch.object(SpecialForTest, '_update')
+        obj = SpecialForTest('env', 'var')
+        obj._batch = 1
+        obj._dirty = True
+
+        obj.__exit__(None, None, None)
+
+        assert obj._batch == 0
+        mock_update.assert_called_once_with()
+
+    def test_update_base(self, mocker):
+        mock_flush = mocker.patch.object(SpecialForTest, '_flush')
+        obj = SpecialForTest('env', 'var')
+        obj._dirty = True
+
+        obj._update()
+
+        assert obj._dirty is False
+        mock_flush.assert_called_once_with()
+
+    def test_update_batch(self, mocker):
+        mock_flush = mocker.patch.object(SpecialForTest, '_flush')
+        obj = SpecialForTest('env', 'var')
+        obj._batch = 1
+
+        obj._update()
+
+        assert obj._dirty is True
+        mock_flush.assert_not_called()
+
+    def test_flush(self):
+        obj = SpecialForTest('env', 'var')
+
+        with pytest.raises(NotImplementedError):
+            obj._flush()
+
     def test_raw(self, mocker):
         env = mocker.Mock(**{
             'get_raw.return_value': 'value'
@@ -47,6 +251,27 @@ class TestSpecial(object):
         assert obj.raw == 'value'
         env.get_raw.assert_called_once_with('var')
 
+    def test_raw_joined(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'value'
+        })
+        obj = SpecialForTest(env, 'var')
+        obj._joined = 'joined'
+
+        assert obj.raw == 'joined'
+        env.get_raw.assert_not_called()
+
+    def test_detach(self, mocker):
+        env = mocker.Mock()
+        obj = SpecialForTest(env, 'var')
+        obj._joined = 'joined'
+
+        obj._detach()
+
+        assert obj._detached is True
+        assert obj._joined is None
+        env.assert_not_called()
+
 
 class TestSpecialList(object):
     def test_with_sep(self, mocker):
@@ -63,7 +288,19 @@ class TestSpecialList(object):
         result2 = result('env', 'var')
 
         assert isinstance(result2, specials.SpecialList)
-        mock_init.assert_called_once_with('env', 'var', sep='|')
+        assert result._sep_default == '|'
+        assert specials.SpecialList.with_sep('|') is result
+        mock_init.assert_called_once_with('env', 'var')
+
+    def test_with_sep_init(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val|ue',
+        })
+
+        result = specials.SpecialList.with_sep('|')(env, 'var')
+
+        assert result._sep == '|'
+        assert result._value == ['val', 'ue']
 
     def test_init_base(self, mocker):
         mock_init = mocker.patch.object(
@@ -78,6 +315,9 @@ class TestSpecialList(object):
 
         assert result._sep == os.pathsep
         assert result._value == ['val', 'ue']
+        assert result._joined == 'val:ue'
+        assert result._batch == 0
+        assert result._dirty is False
         mock_init.assert_called_once_with('env', 'var')
 
     def test_init_alt(self, mocker):
@@ -95,6 +335,15 @@ class TestSpecialList(object):
         assert result._value == ['val', 'ue']
         mock_init.assert_called_once_with('env', 'var')
 
+    def test_init_empty(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': '',
+        })
+
+        result = specials.SpecialList(env, 'var')
+
+        assert result._value == []
+
     def test_init_keyerror(self, mocker):
         @property
         def raw(self):
@@ -111,8 +360,36 @@ class TestSpecialList(object):
 
         assert result._sep == os.pathsep
         assert result._value == []
+        assert result._joined is None
         mock_init.assert_called_once_with('env', 'var')
 
+    def test_batch(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        with obj as result:
+            with obj:
+                obj[0] = 'v'
+                obj.insert(0, 'a')
+            env._set.assert_not_called()
+        assert result is obj
+        assert obj._batch == 0
+        assert obj._dirty is False
+        env._set.assert_called_once_with('var', 'a:v:ue')
+
+    def test_batch_unmodified(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        with obj:
+            pass
+
+        env._set.assert_not_called()
+
     def test_repr(self, mocker):
         env = mocker.Mock(**{
             'get_raw.return_value': 'val:ue',
@@ -138,6 +415,51 @@ class TestSpecialList(object):
         assert obj[0] == 'val'
         assert obj[1] == 'ue'
 
+    def test_iter(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        assert list(iter(obj)) == ['val', 'ue']
+
+    def test_reversed(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        assert list(reversed(obj)) == ['ue', 'val']
+
+    def test_contains(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        assert 'val' in obj
+        assert 'other' not in obj
+
+    def test_index(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue:val',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        assert obj.index('val') == 0
+        assert obj.index('val', 1) == 2
+        with pytest.raises(ValueError):
+            obj.index('val', 1, 2)
+
+    def test_count(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue:val',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        assert obj.count('val') == 2
+        assert obj.count('other') == 0
+
     def test_setitem(self, mocker):
         mock_update = mocker.patch.object(
             specials.SpecialList, '_update',
@@ -154,6 +476,34 @@ class TestSpecialList(object):
         mock_update.assert_has_calls([mocker.call(), mocker.call()])
         assert mock_update.call_count == 2
 
+    def test_setitem_unchanged(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialList, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        obj[0] = 'val'
+
+        assert obj._value == ['val', 'ue']
+        mock_update.assert_not_called()
+
+    def test_setitem_slice(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialList, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'val:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        obj[0:1] = ['val']
+
+        assert obj._value == ['val', 'ue']
+        mock_update.assert_called_once_with()
+
     def test_delitem(self, mocker):
         mock_update = mocker.patch.object(
             specials.SpecialList, '_update',
@@ -239,6 +589,107 @@ class TestSpecialList(object):
         assert obj._value == ['va', 'l', 'ue']
         mock_update.assert_called_once_with()
 
+    def test_extend(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialList, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        obj.extend(['l', 'ue'])
+
+        assert obj._value == ['va', 'ue', 'l', 'ue']
+        mock_update.assert_called_once_with()
+
+    def test_extend_self(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialList, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        obj.extend(obj)
+
+        assert obj._value == ['va', 'ue', 'va', 'ue']
+        mock_update.assert_called_once_with()
+
+    def test_iadd(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialList, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+        orig = obj
+
+        obj += ['l', 'ue']
+
+        assert obj is orig
+        assert obj._value == ['va', 'ue', 'l', 'ue']
+        mock_update.assert_called_once_with()
+
+    def test_iadd_self(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialList, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+        orig = obj
+
+        obj += obj
+
+        assert obj is orig
+        assert obj._value == ['va', 'ue', 'va', 'ue']
+        mock_update.assert_called_once_with()
+
+    def test_insert_append(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialList, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        obj.append('l')
+
+        assert obj._value == ['va', 'ue', 'l']
+        assert obj._joined == 'va:ue:l'
+        env._set.assert_called_once_with('var', 'va:ue:l')
+        mock_update.assert_not_called()
+
+    def test_insert_append_empty(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.side_effect': KeyError('var'),
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        obj.append('l')
+
+        assert obj._value == ['l']
+        assert obj._joined == 'l'
+        env._set.assert_called_once_with('var', 'l')
+
+    def test_insert_append_batch(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialList(env, 'var')
+
+        with obj:
+            obj.append('l')
+
+            assert obj._dirty is True
+
+        env._set.assert_called_once_with('var', 'va:ue:l')
+
 
 class TestSpecialSet(object):
     def test_with_sep(self, mocker):
@@ -255,7 +706,9 @@ class TestSpecialSet(object):
         result2 = result('env', 'var')
 
         assert isinstance(result2, specials.SpecialSet)
-        mock_init.assert_called_once_with('env', 'var', sep='|')
+        assert result._sep_default == '|'
+        assert specials.SpecialSet.with_sep('|') is result
+        mock_init.assert_called_once_with('env', 'var')
 
     def test_init_base(self, mocker):
         mock_init = mocker.patch.object(
@@ -270,6 +723,7 @@ class TestSpecialSet(object):
 
         assert result._sep == os.pathsep
         assert result._value == set(['val', 'ue'])
+        assert result._sorted == ['ue', 'val']
         mock_init.assert_called_once_with('env', 'var')
 
     def test_init_alt(self, mocker):
@@ -366,6 +820,7 @@ class TestSpecialSet(object):
 
         assert obj._value.__class__ == set
         assert obj._value == set(['ue', 'va', 'l'])
+        assert obj._sorted == ['l', 'ue', 'va']
         mock_update.assert_called_once_with()
 
     def test_set_iterable(self, mocker):
@@ -395,6 +850,7 @@ class TestSpecialSet(object):
         obj.delete()
 
         assert obj._value == set()
+        assert obj._sorted == []
         mock_delete.assert_called_once_with()
 
     def test_add(self, mocker):
@@ -409,8 +865,24 @@ class TestSpecialSet(object):
         obj.add('l')
 
         assert obj._value == set(['va', 'ue', 'l'])
+        assert obj._sorted == ['l', 'ue', 'va']
         mock_update.assert_called_once_with()
 
+    def test_add_exists(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialSet, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialSet(env, 'var')
+
+        obj.add('va')
+
+        assert obj._value == set(['va', 'ue'])
+        assert obj._sorted == ['ue', 'va']
+        mock_update.assert_not_called()
+
     def test_discard(self, mocker):
         mock_update = mocker.patch.object(
             specials.SpecialSet, '_update',
@@ -423,8 +895,101 @@ class TestSpecialSet(object):
         obj.discard('l')
 
         assert obj._value == set(['va', 'ue'])
+        assert obj._sorted == ['ue', 'va']
         mock_update.assert_called_once_with()
 
+    def test_discard_missing(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialSet, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialSet(env, 'var')
+
+        obj.discard('l')
+
+        assert obj._value == set(['va', 'ue'])
+        assert obj._sorted == ['ue', 'va']
+        mock_update.assert_not_called()
+
+    def test_ior(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialSet, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialSet(env, 'var')
+        orig = obj
+
+        obj |= ['l', 'va', 'a']
+
+        assert obj is orig
+        assert obj._value == set(['va', 'ue', 'l', 'a'])
+        assert obj._sorted == ['a', 'l', 'ue', 'va']
+        mock_update.assert_called_once_with()
+
+    def test_ior_unchanged(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialSet, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialSet(env, 'var')
+
+        obj |= ['va']
+
+        assert obj._value == set(['va', 'ue'])
+        mock_update.assert_not_called()
+
+    def test_isub(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialSet, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue:l',
+        })
+        obj = specials.SpecialSet(env, 'var')
+        orig = obj
+
+        obj -= ['l', 'va', 'a']
+
+        assert obj is orig
+        assert obj._value == set(['ue'])
+        assert obj._sorted == ['ue']
+        mock_update.assert_called_once_with()
+
+    def test_isub_self(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialSet, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue:l',
+        })
+        obj = specials.SpecialSet(env, 'var')
+
+        obj -= obj
+
+        assert obj._value == set()
+        assert obj._sorted == []
+        mock_update.assert_called_once_with()
+
+    def test_isub_unchanged(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialSet, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'va:ue',
+        })
+        obj = specials.SpecialSet(env, 'var')
+
+        obj -= ['l']
+
+        assert obj._value == set(['va', 'ue'])
+        mock_update.assert_not_called()
+
 
 class TestSpecialDict(object):
     def test_with_sep_base(self, mocker):
@@ -441,11 +1006,10 @@ class TestSpecialDict(object):
         result2 = result('env', 'var')
 
         assert isinstance(result2, specials.SpecialDict)
-        mock_init.assert_called_once_with(
-            'env', 'var',
-            item_sep=os.pathsep,
-            key_sep='=',
-        )
+        assert result._item_sep_default == os.pathsep
+        assert result._key_sep_default == '='
+        assert specials.SpecialDict.with_sep() is result
+        mock_init.assert_called_once_with('env', 'var')
 
     def test_with_sep_alt(self, mocker):
         mock_init = mocker.patch.object(
@@ -461,11 +1025,21 @@ class TestSpecialDict(object):
         result2 = result('env', 'var')
 
         assert isinstance(result2, specials.SpecialDict)
-        mock_init.assert_called_once_with(
-            'env', 'var',
-            item_sep='|',
-            key_sep='/',
-        )
+        assert result._item_sep_default == '|'
+        assert result._key_sep_default == '/'
+        assert specials.SpecialDict.with_sep('|', '/') is result
+        mock_init.assert_called_once_with('env', 'var')
+
+    def test_with_sep_init(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1/v1|k2/v2',
+        })
+
+        result = specials.SpecialDict.with_sep('|', '/')(env, 'var')
+
+        assert result._item_sep == '|'
+        assert result._key_sep == '/'
+        assert result._value == {'k1': 'v1', 'k2': 'v2'}
 
     def test_init_base(self, mocker):
         mock_init = mocker.patch.object(
@@ -553,6 +1127,27 @@ class TestSpecialDict(object):
         assert obj['k1'] == 'v1'
         assert obj['k2'] == 'v2'
 
+    def test_contains(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1:k2',
+        })
+        obj = specials.SpecialDict(env, 'var')
+
+        assert 'k1' in obj
+        assert 'k2' in obj
+        assert 'k3' not in obj
+
+    def test_get(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1:k2',
+        })
+        obj = specials.SpecialDict(env, 'var')
+
+        assert obj.get('k1') == 'v1'
+        assert obj.get('k2', 'default') is None
+        assert obj.get('k3') is None
+        assert obj.get('k3', 'default') == 'default'
+
     def test_setitem(self, mocker):
         mock_update = mocker.patch.object(
             specials.SpecialDict, '_update',
@@ -569,6 +1164,35 @@ class TestSpecialDict(object):
         mock_update.assert_has_calls([mocker.call(), mocker.call()])
         assert mock_update.call_count == 2
 
+    def test_setitem_unchanged(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialDict, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1:k2',
+        })
+        obj = specials.SpecialDict(env, 'var')
+
+        obj['k1'] = 'v1'
+        obj['k2'] = None
+
+        assert obj._value == {'k1': 'v1', 'k2': None}
+        mock_update.assert_not_called()
+
+    def test_setitem_missing_none(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialDict, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1',
+        })
+        obj = specials.SpecialDict(env, 'var')
+
+        obj['k2'] = None
+
+        assert obj._value == {'k1': 'v1', 'k2': None}
+        mock_update.assert_called_once_with()
+
     def test_delitem(self, mocker):
         mock_update = mocker.patch.object(
             specials.SpecialDict, '_update',
@@ -596,6 +1220,46 @@ class TestSpecialDict(object):
 
         mock_set.assert_called_once_with('k1=v1:k2:k3=v3')
 
+    def test_batch(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1',
+        })
+        obj = specials.SpecialDict(env, 'var')
+
+        with obj:
+            obj['k2'] = 'v2'
+            del obj['k1']
+            env._set.assert_not_called()
+
+        env._set.assert_called_once_with('var', 'k2=v2')
+
+    def test_update_nonstring(self, mocker):
+        mock_set = mocker.patch.object(
+            specials.Special, 'set',
+        )
+        env = mocker.Mock(**{
+            'get_raw.side_effect': KeyError('var'),
+        })
+        obj = specials.SpecialDict(env, 'var')
+        obj._value = {1: 2, 3: None}
+
+        obj._update()
+
+        mock_set.assert_called_once_with('1=2:3')
+
+    def test_update_sorted(self, mocker):
+        mock_set = mocker.patch.object(
+            specials.Special, 'set',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'c:b:a=1',
+        })
+        obj = specials.SpecialDict(env, 'var')
+
+        obj._update()
+
+        mock_set.assert_called_once_with('a=1:b:c')
+
     def test_split(self, mocker):
         @property
         def raw(self):
@@ -669,11 +1333,10 @@ class TestSpecialOrderedDict(object):
         result2 = result('env', 'var')
 
         assert isinstance(result2, specials.SpecialOrderedDict)
-        mock_init.assert_called_once_with(
-            'env', 'var',
-            item_sep=os.pathsep,
-            key_sep='=',
-        )
+        assert result._item_sep_default == os.pathsep
+        assert result._key_sep_default == '='
+        assert specials.SpecialOrderedDict.with_sep() is result
+        mock_init.assert_called_once_with('env', 'var')
 
     def test_with_sep_alt(self, mocker):
         mock_init = mocker.patch.object(
@@ -689,11 +1352,10 @@ class TestSpecialOrderedDict(object):
         result2 = result('env', 'var')
 
         assert isinstance(result2, specials.SpecialOrderedDict)
-        mock_init.assert_called_once_with(
-            'env', 'var',
-            item_sep='|',
-            key_sep='/',
-        )
+        assert result._item_sep_default == '|'
+        assert result._key_sep_default == '/'
+        assert specials.SpecialOrderedDict.with_sep('|', '/') is result
+        mock_init.assert_called_once_with('env', 'var')
 
     def test_init_base(self, mocker):
         mock_init = mocker.patch.object(
@@ -743,7 +1405,7 @@ class TestSpecialOrderedDict(object):
 
         assert result._item_sep == os.pathsep
         assert result._key_sep == '='
-        assert result._value.__class__ == collections.OrderedDict
+        assert result._value.__class__ == specials._OrderedDict
         assert result._value == {}
         mock_init.assert_called_once_with('env', 'var')
 
@@ -782,6 +1444,27 @@ class TestSpecialOrderedDict(object):
         assert obj['k1'] == 'v1'
         assert obj['k2'] == 'v2'
 
+    def test_contains(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1:k2',
+        })
+        obj = specials.SpecialOrderedDict(env, 'var')
+
+        assert 'k1' in obj
+        assert 'k2' in obj
+        assert 'k3' not in obj
+
+    def test_get(self, mocker):
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1:k2',
+        })
+        obj = specials.SpecialOrderedDict(env, 'var')
+
+        assert obj.get('k1') == 'v1'
+        assert obj.get('k2', 'default') is None
+        assert obj.get('k3') is None
+        assert obj.get('k3', 'default') == 'default'
+
     def test_setitem(self, mocker):
         mock_update = mocker.patch.object(
             specials.SpecialOrderedDict, '_update',
@@ -798,6 +1481,35 @@ class TestSpecialOrderedDict(object):
         mock_update.assert_has_calls([mocker.call(), mocker.call()])
         assert mock_update.call_count == 2
 
+    def test_setitem_unchanged(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialOrderedDict, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1:k2',
+        })
+        obj = specials.SpecialOrderedDict(env, 'var')
+
+        obj['k1'] = 'v1'
+        obj['k2'] = None
+
+        assert obj._value == {'k1': 'v1', 'k2': None}
+        mock_update.assert_not_called()
+
+    def test_setitem_missing_none(self, mocker):
+        mock_update = mocker.patch.object(
+            specials.SpecialOrderedDict, '_update',
+        )
+        env = mocker.Mock(**{
+            'get_raw.return_value': 'k1=v1',
+        })
+        obj = specials.SpecialOrderedDict(env, 'var')
+
+        obj['k2'] = None
+
+        assert obj._value == {'k1': 'v1', 'k2': None}
+        mock_update.assert_called_once_with()
+
     def test_delitem(self, mocker):
         mock_update = mocker.patch.object(
             specials.SpecialOrderedDict, '_update',
@@ -836,7 +1548,7 @@ class TestSpecialOrderedDict(object):
 
         result = obj._split('k1=v1:k2:k3=v3')
 
-        assert result.__class__ == collections.OrderedDict
+        assert result.__class__ == specials._OrderedDict
         assert result == {'k1': 'v1', 'k2': None, 'k3': 'v3'}
 
     def test_set_string(self, mocker):
@@ -850,7 +1562,7 @@ class TestSpecialOrderedDict(object):
 
         obj.set('k3=v3:k4=v4')
 
-        assert obj._value.__class__ == collections.OrderedDict
+        assert obj._value.__class__ == specials._OrderedDict
         assert obj._value == {'k3': 'v3', 'k4': 'v4'}
         mock_update.assert_called_once_with()
 
@@ -866,7 +1578,7 @@ class TestSpecialOrderedDict(object):
 
         obj.set(value)
 
-        assert obj._value.__class__ == collections.OrderedDict
+        assert obj._value.__class__ == specials._OrderedDict
         assert obj._value == {'k3': 'v3', 'k4': 'v4'}
         assert id(obj._value) != id(value)
         mock_update.assert_called_once_with()
@@ -882,7 +1594,7 @@ class TestSpecialOrderedDict(object):
 
         obj.set([('k3', 'v3'), ('k4', 'v4')])
 
-        assert obj._value.__class__ == collections.OrderedDict
+        assert obj._value.__class__ == specials._OrderedDict
         assert obj._value == {'k3': 'v3', 'k4': 'v4'}
         mock_update.assert_called_once_with()
 
@@ -897,6 +1609,6 @@ class TestSpecialOrderedDict(object):
 
         obj.delete()
 
-        assert obj._value.__class__ == collections.OrderedDict
+        assert obj._value.__class__ == specials._OrderedDict
         assert obj._value == {}
         mock_delete.assert_called_once_with()
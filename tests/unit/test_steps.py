@@ -30,6 +30,18 @@ class TestStepItem(object):
         assert result.addr == 'addr'
         mock_validate.assert_called_once_with('name', 'config', 'addr')
 
+    def test_slots(self):
+        class SlottedForTest(steps.StepItem):
+            __slots__ = ()
+
+            def validate(self, name, config, addr):
+                return config
+
+        result = SlottedForTest('name', 'config', 'addr')
+
+        assert not hasattr(result, '__dict__')
+        assert result.config == 'config'
+
 
 class BaseA(object):
     pass
@@ -62,6 +74,21 @@ class TestModifierMeta(object):
             {'a': 1, 'b': 2},
         )
 
+    def test_new_inherited(self):
+        base = steps.ModifierMeta('Base', (object,), {
+            'required': set(['r1']),
+        })
+
+        result = steps.ModifierMeta('name', (base,), {
+            'required': set(['r2']),
+            'prohibited': set(['p1']),
+        })
+
+        assert result.required == frozenset(['r1', 'r2'])
+        assert result.prohibited == frozenset(['p1'])
+        assert result.before == frozenset()
+        assert isinstance(result.before, frozenset)
+
 
 class ModifierForTest(steps.Modifier):
     def validate(self, name, config, addr):
@@ -95,29 +122,76 @@ class TestStepMeta(object):
         mock_inherit_set.assert_called_once_with(
             ['metadata_keys'], (BaseA, BaseB, BaseC), {'a': 1, 'b': 2},
         )
+        assert not hasattr(result, '_group_acts')
+        assert not hasattr(result, '_group_mods')
+
+    def test_new_namespaces(self, mocker):
+        mocker.patch.object(
+            steps.entrypointer.eps, 'test.actions', 'actions',
+        )
+        mocker.patch.object(
+            steps.entrypointer.eps, 'test.modifiers', 'modifiers',
+        )
+
+        result = steps.StepMeta('name', (BaseA,), {
+            'namespace_actions': 'test.actions',
+            'namespace_modifiers': 'test.modifiers',
+        })
+
+        assert result._group_acts == 'actions'
+        assert result._group_mods == 'modifiers'
+
+    def test_new_abstract_namespaces(self):
+        result = steps.StepMeta('name', (steps.Step,), {})
+
+        assert result._group_acts is None
+        assert result._group_mods is None
+
+
+def raise_for_test():
+    # Raise and catch an exception, so that it has a traceback
+    try:
+        raise ExceptionForTest('test')
+    except ExceptionForTest as exc:
+        return exc
 
 
 class TestExceptionResult(object):
     def test_init(self):
-        exc_info = ('type', 'value', 'traceback')
+        exc = raise_for_test()
 
-        result = steps.ExceptionResult(exc_info)
+        result = steps.ExceptionResult(exc)
 
-        assert result.exc_info == exc_info
-        assert result.type_ == 'type'
-        assert result.value == 'value'
-        assert result.traceback == 'traceback'
+        assert result.value is exc
+        assert result.type_ is ExceptionForTest
+        assert result.traceback is exc.__traceback__
+        assert result.exc_info == (ExceptionForTest, exc, exc.__traceback__)
 
-    def test_reraise(self, mocker):
-        mock_reraise = mocker.patch.object(
-            steps.six, 'reraise',
+    def test_init_exc_info(self):
+        exc = raise_for_test()
+
+        result = steps.ExceptionResult(
+            (ExceptionForTest, exc, exc.__traceback__),
         )
-        exc_info = ('type', 'value', 'traceback')
-        obj = steps.ExceptionResult(exc_info)
 
-        obj.reraise()
+        assert result.value is exc
+        assert result.type_ is ExceptionForTest
+        assert result.traceback is exc.__traceback__
+
+    def test_reraise(self):
+        exc = raise_for_test()
+        tb = exc.__traceback__
+        obj = steps.ExceptionResult(exc)
 
-        mock_reraise.assert_called_once_with('type', 'value', 'traceback')
+        with pytest.raises(ExceptionForTest) as exc_info:
+            obj.reraise()
+        assert exc_info.value is exc
+        chain = []
+        tmp = exc_info.tb
+        while tmp is not None:
+            chain.append(tmp)
+            tmp = tmp.tb_next
+        assert tb in chain
 
 
 class StepForTest(steps.Step):
@@ -129,44 +203,28 @@ class StepForTest(steps.Step):
         return metadata
 
 
-class TestStep(object):
-    def test_get_action_cached(self, mocker):
-        klass = mocker.Mock(return_value='action')
-        cached = mocker.Mock(return_value='cached')
-        mocker.patch.object(
-            steps.entrypointer.eps, 'stepmaker.actions', {'test': klass},
-        )
-        mocker.patch.object(
-            StepForTest, '_group_acts', {'test': cached},
-        )
-        addr = addresses.StepAddress('file.name', '/some/path')
+def make_lookup(mocker, actions_map, modifiers_map):
+    # Build a side effect for Step._lookup() that returns classes
+    # constructing the given actions and modifiers
+    entries = {}
+    for tag, items in ((steps._ACTION, actions_map),
+                       (steps._MODIFIER, modifiers_map)):
+        for name, obj in items.items():
+            entries[name] = (tag, mocker.Mock(return_value=obj))
+    return entries.get
 
-        result = StepForTest._get_action('test', 'value', addr)
-
-        assert result == 'cached'
-        assert StepForTest._group_acts == {'test': cached}
-        klass.assert_not_called()
-        cached.assert_called_once_with('test', 'value', mocker.ANY)
-        other_addr = cached.call_args[0][-1]
-        assert isinstance(other_addr, addresses.StepAddress)
-        assert id(other_addr) != id(addr)
-        assert other_addr.filename == addr.filename
-        assert other_addr.path == '/some/path/test'
 
-    def test_get_action_uncached(self, mocker):
+class TestStep(object):
+    def test_get_action(self, mocker):
         klass = mocker.Mock(return_value='action')
         mocker.patch.object(
-            steps.entrypointer.eps, 'stepmaker.actions', {'test': klass},
-        )
-        mocker.patch.object(
-            StepForTest, '_group_acts', None,
+            StepForTest, '_group_acts', {'test': klass},
         )
         addr = addresses.StepAddress('file.name', '/some/path')
 
         result = StepForTest._get_action('test', 'value', addr)
 
         assert result == 'action'
-        assert StepForTest._group_acts == {'test': klass}
         klass.assert_called_once_with('test', 'value', mocker.ANY)
         other_addr = klass.call_args[0][-1]
         assert isinstance(other_addr, addresses.StepAddress)
@@ -177,10 +235,7 @@ class TestStep(object):
     def test_get_action_set(self, mocker):
         klass = mocker.Mock(return_value='action')
         mocker.patch.object(
-            steps.entrypointer.eps, 'stepmaker.actions', {'test': klass},
-        )
-        mocker.patch.object(
-            StepForTest, '_group_acts', None,
+            StepForTest, '_group_acts', {'test': klass},
         )
         addr = addresses.StepAddress('file.name', '/some/path')
         action = mocker.Mock()
@@ -188,81 +243,164 @@ class TestStep(object):
 
         with pytest.raises(exceptions.StepError) as exc_info:
             StepForTest._get_action('test', 'value', addr, action)
-        assert StepForTest._group_acts == {'test': klass}
         klass.assert_not_called()
         other_addr = exc_info.value.addr
         assert other_addr is addr
 
-    def test_get_modifier_cached(self, mocker):
-        klass = mocker.Mock(return_value='modifier')
-        cached = mocker.Mock(return_value='cached')
+    def test_lookup_cached(self, mocker):
+        klass = mocker.Mock()
+        acts = mocker.patch.object(StepForTest, '_group_acts')
+        mods = mocker.patch.object(StepForTest, '_group_mods')
         mocker.patch.object(
-            steps.entrypointer.eps, 'stepmaker.modifiers', {'test': klass},
+            StepForTest, '_dispatch', {'test': (steps._ACTION, klass)},
         )
+
+        result = StepForTest._lookup('test')
+
+        assert result == (steps._ACTION, klass)
+        acts.get.assert_not_called()
+        mods.get.assert_not_called()
+
+    def test_lookup_action(self, mocker):
+        klass = mocker.Mock()
         mocker.patch.object(
-            StepForTest, '_group_mods', {'test': cached},
+            StepForTest, '_group_acts', {'test': klass},
         )
-        addr = addresses.StepAddress('file.name', '/some/path')
-        mod_map = {
-            'mod1': 'modifier1',
-            'mod2': 'modifier2',
-        }
+        mocker.patch.object(
+            StepForTest, '_group_mods', {'test': 'modifier'},
+        )
+        mocker.patch.object(StepForTest, '_dispatch', {})
 
-        StepForTest._get_modifier('test', 'value', addr, mod_map)
+        result = StepForTest._lookup('test')
 
-        assert mod_map == {
-            'mod1': 'modifier1',
-            'mod2': 'modifier2',
-            'test': 'cached',
-        }
-        assert StepForTest._group_mods == {'test': cached}
-        klass.assert_not_called()
-        cached.assert_called_once_with('test', 'value', mocker.ANY)
-        other_addr = cached.call_args[0][-1]
-        assert isinstance(other_addr, addresses.StepAddress)
-        assert id(other_addr) != id(addr)
-        assert other_addr.filename == addr.filename
-        assert other_addr.path == '/some/path/test'
+        assert result == (steps._ACTION, klass)
+        assert StepForTest._dispatch == {'test': (steps._ACTION, klass)}
 
-    def test_get_modifier_uncached(self, mocker):
-        klass = mocker.Mock(return_value='modifier')
+    def test_lookup_modifier(self, mocker):
+        klass = mocker.Mock()
         mocker.patch.object(
-            steps.entrypointer.eps, 'stepmaker.modifiers', {'test': klass},
+            StepForTest, '_group_acts', {},
         )
         mocker.patch.object(
-            StepForTest, '_group_mods', None,
+            StepForTest, '_group_mods', {'test': klass},
         )
-        addr = addresses.StepAddress('file.name', '/some/path')
-        mod_map = {
-            'mod1': 'modifier1',
-            'mod2': 'modifier2',
+        mocker.patch.object(StepForTest, '_dispatch', {})
+
+        result = StepForTest._lookup('test')
+
+        assert result == (steps._MODIFIER, klass)
+        assert StepForTest._dispatch == {'test': (steps._MODIFIER, klass)}
+
+    def test_lookup_missing(self, mocker):
+        mocker.patch.object(
+            StepForTest, '_group_acts', {},
+        )
+        mocker.patch.object(
+            StepForTest, '_group_mods', {},
+        )
+        mocker.patch.object(StepForTest, '_dispatch', {})
+
+        result = StepForTest._lookup('test')
+
+        assert result is None
+        assert StepForTest._dispatch == {}
+
+    def test_sort_modifiers_empty(self, mocker):
+        mock_sort_modifiers = mocker.patch.object(
+            steps.utils, '_sort_modifiers',
+        )
+        mocker.patch.object(StepForTest, '_sort_cache', {})
+
+        result = StepForTest._sort_modifiers({})
+
+        assert result == []
+        assert StepForTest._sort_cache == {}
+        mock_sort_modifiers.assert_not_called()
+
+    def test_sort_modifiers_uncached(self, mocker):
+        modifiers = {}
+        for name in ('mod1', 'mod2', 'mod3'):
+            modifiers[name] = mocker.Mock()
+            modifiers[name].name = name
+        mock_sort_modifiers = mocker.patch.object(
+            steps.utils, '_sort_modifiers',
+            return_value=[
+                modifiers['mod2'], modifiers['mod3'], modifiers['mod1'],
+            ],
+        )
+        mocker.patch.object(StepForTest, '_sort_cache', {})
+
+        result = StepForTest._sort_modifiers(modifiers)
+
+        assert result == [
+            modifiers['mod2'], modifiers['mod3'], modifiers['mod1'],
+        ]
+        assert StepForTest._sort_cache == {
+            frozenset(['mod1', 'mod2', 'mod3']): ('mod2', 'mod3', 'mod1'),
         }
+        mock_sort_modifiers.assert_called_once_with(modifiers)
 
-        StepForTest._get_modifier('test', 'value', addr, mod_map)
+    def test_sort_modifiers_uncached_keys(self, mocker):
+        modifiers = {}
+        for key in ('key1', 'key2'):
+            modifiers[key] = mocker.Mock()
+            modifiers[key].name = 'other'
+        mocker.patch.object(
+            steps.utils, '_sort_modifiers',
+            return_value=[modifiers['key2'], modifiers['key1']],
+        )
+        mocker.patch.object(StepForTest, '_sort_cache', {})
+
+        result = StepForTest._sort_modifiers(modifiers)
+
+        assert result == [modifiers['key2'], modifiers['key1']]
+        assert StepForTest._sort_cache == {
+            frozenset(['key1', 'key2']): ('key2', 'key1'),
+        }
 
-        assert mod_map == {
+    def test_sort_modifiers_cached(self, mocker):
+        modifiers = {
             'mod1': 'modifier1',
             'mod2': 'modifier2',
-            'test': 'modifier',
+            'mod3': 'modifier3',
         }
-        assert StepForTest._group_mods == {'test': klass}
-        klass.assert_called_once_with('test', 'value', mocker.ANY)
-        other_addr = klass.call_args[0][-1]
-        assert isinstance(other_addr, addresses.StepAddress)
-        assert id(other_addr) != id(addr)
-        assert other_addr.filename == addr.filename
-        assert other_addr.path == '/some/path/test'
+        mock_sort_modifiers = mocker.patch.object(
+            steps.utils, '_sort_modifiers',
+        )
+        mocker.patch.object(StepForTest, '_sort_cache', {
+            frozenset(['mod1', 'mod2', 'mod3']): ('mod2', 'mod3', 'mod1'),
+        })
+
+        result = StepForTest._sort_modifiers(modifiers)
+
+        assert result == ['modifier2', 'modifier3', 'modifier1']
+        mock_sort_modifiers.assert_not_called()
+
+    def test_sort_modifiers_full(self, mocker):
+        modifiers = {'mod1': mocker.Mock()}
+        modifiers['mod1'].name = 'mod1'
+        mocker.patch.object(
+            steps.utils, '_sort_modifiers',
+            return_value=[modifiers['mod1']],
+        )
+        mocker.patch.object(steps, '_CLASS_CACHE_SIZE', 0)
+        mocker.patch.object(StepForTest, '_sort_cache', {})
+
+        result = StepForTest._sort_modifiers(modifiers)
+
+        assert result == [modifiers['mod1']]
+        assert StepForTest._sort_cache == {}
 
     def test_parse_short_circuit(self, mocker):
         mock_get_action = mocker.patch.object(
             StepForTest, '_get_action',
             return_value='action',
         )
-        mock_get_modifier = mocker.patch.object(
-            StepForTest, '_get_modifier',
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
         )
         mock_sort_modifiers = mocker.patch.object(
-            steps.utils, '_sort_modifiers',
+            StepForTest, '_sort_modifiers',
             return_value='sorted',
         )
         mock_init = mocker.patch.object(
@@ -274,13 +412,11 @@ class TestStep(object):
 
         assert isinstance(result, StepForTest)
         mock_get_action.assert_called_once_with('test', None, 'addr')
-        mock_get_modifier.assert_not_called()
+        mock_lookup.assert_not_called()
         mock_sort_modifiers.assert_not_called()
         mock_init.assert_called_once_with('action', 'addr')
 
     def test_parse_base(self, mocker):
-        def fake_get_modifier(name, value, addr, modifiers):
-            modifiers[name] = modifiers_map[name]
         actions_map = {
             'test': mocker.Mock(eager=False),
         }
@@ -302,22 +438,20 @@ class TestStep(object):
         }
         for name, modifier in modifiers_map.items():
             modifier.name = name
-        mock_get_action = mocker.patch.object(
-            StepForTest, '_get_action',
-            side_effect=lambda name, value, addr, action: actions_map[name],
-        )
-        mock_get_modifier = mocker.patch.object(
-            StepForTest, '_get_modifier',
-            side_effect=fake_get_modifier,
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, modifiers_map),
         )
+        mocker.patch.object(StepForTest, '_compat_cache', set())
         mock_sort_modifiers = mocker.patch.object(
-            steps.utils, '_sort_modifiers',
+            StepForTest, '_sort_modifiers',
             return_value='sorted',
         )
         mock_init = mocker.patch.object(
             StepForTest, '__init__',
             return_value=None,
         )
+        addr = addresses.StepAddress('file.name', '/some/path')
         config = {
             'test': 'action config',
             'mod1': 'mod1 config',
@@ -327,33 +461,55 @@ class TestStep(object):
             'meta2': 'metadata 2',
         }
 
-        result = StepForTest.parse(config, 'addr')
+        result = StepForTest.parse(config, addr)
 
         assert isinstance(result, StepForTest)
-        mock_get_action.assert_has_calls([
-            mocker.call('test', 'action config', 'addr', None),
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
+        mock_lookup.assert_has_calls([
+            mocker.call('test'),
+            mocker.call('mod1'),
+            mocker.call('mod2'),
+            mocker.call('mod3'),
         ], any_order=True)
-        assert mock_get_action.call_count == 4
-        mock_get_modifier.assert_has_calls([
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
-        ], any_order=True)
-        assert mock_get_modifier.call_count == 3
+        assert mock_lookup.call_count == 4
         mock_sort_modifiers.assert_called_once_with(modifiers_map)
+        assert StepForTest._compat_cache == set([
+            (frozenset(['mod1', 'mod2', 'mod3']), steps.Modifier.LAZY),
+        ])
         mock_init.assert_called_once_with(
-            actions_map['test'], 'addr', 'sorted', {
+            actions_map['test'], addr, 'sorted', {
                 'meta1': 'metadata 1',
                 'meta2': 'metadata 2',
             },
         )
 
+    def test_parse_interns_keys(self, mocker):
+        actions_map = {
+            'test': mocker.Mock(eager=False),
+        }
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, {}),
+        )
+        mock_init = mocker.patch.object(
+            StepForTest, '__init__',
+            return_value=None,
+        )
+        addr = addresses.StepAddress('file.name', '/some/path')
+        key = ''.join(['te', 'st'])
+        meta_key = ''.join(['me', 'ta1'])
+        assert key is not sys.intern('test')
+        config = {
+            key: 'action config',
+            meta_key: 'metadata 1',
+        }
+
+        StepForTest.parse(config, addr)
+
+        assert mock_lookup.call_args[0][0] is sys.intern('test')
+        metadata = mock_init.call_args[0][3]
+        assert list(metadata)[0] is sys.intern('meta1')
+
     def test_parse_missing_modifier(self, mocker):
-        def fake_get_modifier(name, value, addr, modifiers):
-            modifiers[name] = modifiers_map[name]
         actions_map = {
             'test': mocker.Mock(eager=False),
         }
@@ -375,22 +531,20 @@ class TestStep(object):
         }
         for name, modifier in modifiers_map.items():
             modifier.name = name
-        mocker.patch.object(
-            StepForTest, '_get_action',
-            side_effect=lambda name, value, addr, action: actions_map[name],
-        )
-        mock_get_modifier = mocker.patch.object(
-            StepForTest, '_get_modifier',
-            side_effect=fake_get_modifier,
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, modifiers_map),
         )
+        mocker.patch.object(StepForTest, '_compat_cache', set())
         mock_sort_modifiers = mocker.patch.object(
-            steps.utils, '_sort_modifiers',
+            StepForTest, '_sort_modifiers',
             return_value='sorted',
         )
         mock_init = mocker.patch.object(
             StepForTest, '__init__',
             return_value=None,
         )
+        addr = addresses.StepAddress('file.name', '/some/path')
         config = {
             'test': 'action config',
             'mod1': 'mod1 config',
@@ -402,20 +556,16 @@ class TestStep(object):
         }
 
         with pytest.raises(exceptions.StepError):
-            StepForTest.parse(config, 'addr')
-        # Dict ordering controls whether _get_action() gets called on
-        # anything, so don't even check; also controls whether
-        # _get_modifier() gets called on everything, so just check the
-        # case that should fail
-        mock_get_modifier.assert_has_calls([
-            mocker.call('mod4', 'mod4 config', 'addr', mocker.ANY),
+            StepForTest.parse(config, addr)
+        # Dict ordering controls whether _lookup() gets called on
+        # everything, so just check the case that should fail
+        mock_lookup.assert_has_calls([
+            mocker.call('mod4'),
         ], any_order=True)
         mock_sort_modifiers.assert_not_called()
         mock_init.assert_not_called()
 
     def test_parse_missing_action(self, mocker):
-        def fake_get_modifier(name, value, addr, modifiers):
-            modifiers[name] = modifiers_map[name]
         actions_map = {
             'test': mocker.Mock(eager=False),
         }
@@ -437,22 +587,20 @@ class TestStep(object):
         }
         for name, modifier in modifiers_map.items():
             modifier.name = name
-        mock_get_action = mocker.patch.object(
-            StepForTest, '_get_action',
-            side_effect=lambda name, value, addr, action: actions_map[name],
-        )
-        mock_get_modifier = mocker.patch.object(
-            StepForTest, '_get_modifier',
-            side_effect=fake_get_modifier,
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, modifiers_map),
         )
+        mocker.patch.object(StepForTest, '_compat_cache', set())
         mock_sort_modifiers = mocker.patch.object(
-            steps.utils, '_sort_modifiers',
+            StepForTest, '_sort_modifiers',
             return_value='sorted',
         )
         mock_init = mocker.patch.object(
             StepForTest, '__init__',
             return_value=None,
         )
+        addr = addresses.StepAddress('file.name', '/some/path')
         config = {
             'mod1': 'mod1 config',
             'mod2': 'mod2 config',
@@ -462,25 +610,49 @@ class TestStep(object):
         }
 
         with pytest.raises(exceptions.StepError):
-            StepForTest.parse(config, 'addr')
-        mock_get_action.assert_has_calls([
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
+            StepForTest.parse(config, addr)
+        mock_lookup.assert_has_calls([
+            mocker.call('mod1'),
+            mocker.call('mod2'),
+            mocker.call('mod3'),
         ], any_order=True)
-        assert mock_get_action.call_count == 3
-        mock_get_modifier.assert_has_calls([
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
-        ], any_order=True)
-        assert mock_get_modifier.call_count == 3
+        assert mock_lookup.call_count == 3
+        mock_sort_modifiers.assert_not_called()
+        mock_init.assert_not_called()
+
+    def test_parse_multiple_actions(self, mocker):
+        actions_map = {
+            'test1': mocker.Mock(eager=False),
+            'test2': mocker.Mock(eager=False),
+        }
+        for name, action in actions_map.items():
+            action.name = name
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, {}),
+        )
+        mock_sort_modifiers = mocker.patch.object(
+            StepForTest, '_sort_modifiers',
+            return_value='sorted',
+        )
+        mock_init = mocker.patch.object(
+            StepForTest, '__init__',
+            return_value=None,
+        )
+        addr = addresses.StepAddress('file.name', '/some/path')
+        config = {
+            'test1': 'action config 1',
+            'test2': 'action config 2',
+        }
+
+        with pytest.raises(exceptions.StepError) as exc_info:
+            StepForTest.parse(config, addr)
+        assert exc_info.value.addr is addr
+        assert mock_lookup.call_count == 2
         mock_sort_modifiers.assert_not_called()
         mock_init.assert_not_called()
 
     def test_parse_lazy_only_modifier(self, mocker):
-        def fake_get_modifier(name, value, addr, modifiers):
-            modifiers[name] = modifiers_map[name]
         actions_map = {
             'test': mocker.Mock(eager=True),
         }
@@ -502,22 +674,20 @@ class TestStep(object):
         }
         for name, modifier in modifiers_map.items():
             modifier.name = name
-        mock_get_action = mocker.patch.object(
-            StepForTest, '_get_action',
-            side_effect=lambda name, value, addr, action: actions_map[name],
-        )
-        mock_get_modifier = mocker.patch.object(
-            StepForTest, '_get_modifier',
-            side_effect=fake_get_modifier,
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, modifiers_map),
         )
+        mocker.patch.object(StepForTest, '_compat_cache', set())
         mock_sort_modifiers = mocker.patch.object(
-            steps.utils, '_sort_modifiers',
+            StepForTest, '_sort_modifiers',
             return_value='sorted',
         )
         mock_init = mocker.patch.object(
             StepForTest, '__init__',
             return_value=None,
         )
+        addr = addresses.StepAddress('file.name', '/some/path')
         config = {
             'test': 'action config',
             'mod1': 'mod1 config',
@@ -528,26 +698,18 @@ class TestStep(object):
         }
 
         with pytest.raises(exceptions.StepError):
-            StepForTest.parse(config, 'addr')
-        mock_get_action.assert_has_calls([
-            mocker.call('test', 'action config', 'addr', None),
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
-        ], any_order=True)
-        assert mock_get_action.call_count == 4
-        mock_get_modifier.assert_has_calls([
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
+            StepForTest.parse(config, addr)
+        mock_lookup.assert_has_calls([
+            mocker.call('test'),
+            mocker.call('mod1'),
+            mocker.call('mod2'),
+            mocker.call('mod3'),
         ], any_order=True)
-        assert mock_get_modifier.call_count == 3
+        assert mock_lookup.call_count == 4
         mock_sort_modifiers.assert_not_called()
         mock_init.assert_not_called()
 
     def test_parse_eager_only_modifier(self, mocker):
-        def fake_get_modifier(name, value, addr, modifiers):
-            modifiers[name] = modifiers_map[name]
         actions_map = {
             'test': mocker.Mock(eager=False),
         }
@@ -569,22 +731,20 @@ class TestStep(object):
         }
         for name, modifier in modifiers_map.items():
             modifier.name = name
-        mock_get_action = mocker.patch.object(
-            StepForTest, '_get_action',
-            side_effect=lambda name, value, addr, action: actions_map[name],
-        )
-        mock_get_modifier = mocker.patch.object(
-            StepForTest, '_get_modifier',
-            side_effect=fake_get_modifier,
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, modifiers_map),
         )
+        mocker.patch.object(StepForTest, '_compat_cache', set())
         mock_sort_modifiers = mocker.patch.object(
-            steps.utils, '_sort_modifiers',
+            StepForTest, '_sort_modifiers',
             return_value='sorted',
         )
         mock_init = mocker.patch.object(
             StepForTest, '__init__',
             return_value=None,
         )
+        addr = addresses.StepAddress('file.name', '/some/path')
         config = {
             'test': 'action config',
             'mod1': 'mod1 config',
@@ -595,26 +755,18 @@ class TestStep(object):
         }
 
         with pytest.raises(exceptions.StepError):
-            StepForTest.parse(config, 'addr')
-        mock_get_action.assert_has_calls([
-            mocker.call('test', 'action config', 'addr', None),
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
+            StepForTest.parse(config, addr)
+        mock_lookup.assert_has_calls([
+            mocker.call('test'),
+            mocker.call('mod1'),
+            mocker.call('mod2'),
+            mocker.call('mod3'),
         ], any_order=True)
-        assert mock_get_action.call_count == 4
-        mock_get_modifier.assert_has_calls([
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
-        ], any_order=True)
-        assert mock_get_modifier.call_count == 3
+        assert mock_lookup.call_count == 4
         mock_sort_modifiers.assert_not_called()
         mock_init.assert_not_called()
 
     def test_parse_prohibited_modifier(self, mocker):
-        def fake_get_modifier(name, value, addr, modifiers):
-            modifiers[name] = modifiers_map[name]
         actions_map = {
             'test': mocker.Mock(eager=False),
         }
@@ -636,22 +788,20 @@ class TestStep(object):
         }
         for name, modifier in modifiers_map.items():
             modifier.name = name
-        mock_get_action = mocker.patch.object(
-            StepForTest, '_get_action',
-            side_effect=lambda name, value, addr, action: actions_map[name],
-        )
-        mock_get_modifier = mocker.patch.object(
-            StepForTest, '_get_modifier',
-            side_effect=fake_get_modifier,
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, modifiers_map),
         )
+        mocker.patch.object(StepForTest, '_compat_cache', set())
         mock_sort_modifiers = mocker.patch.object(
-            steps.utils, '_sort_modifiers',
+            StepForTest, '_sort_modifiers',
             return_value='sorted',
         )
         mock_init = mocker.patch.object(
             StepForTest, '__init__',
             return_value=None,
         )
+        addr = addresses.StepAddress('file.name', '/some/path')
         config = {
             'test': 'action config',
             'mod1': 'mod1 config',
@@ -662,26 +812,18 @@ class TestStep(object):
         }
 
         with pytest.raises(exceptions.StepError):
-            StepForTest.parse(config, 'addr')
-        mock_get_action.assert_has_calls([
-            mocker.call('test', 'action config', 'addr', None),
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
-        ], any_order=True)
-        assert mock_get_action.call_count == 4
-        mock_get_modifier.assert_has_calls([
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
+            StepForTest.parse(config, addr)
+        mock_lookup.assert_has_calls([
+            mocker.call('test'),
+            mocker.call('mod1'),
+            mocker.call('mod2'),
+            mocker.call('mod3'),
         ], any_order=True)
-        assert mock_get_modifier.call_count == 3
+        assert mock_lookup.call_count == 4
         mock_sort_modifiers.assert_not_called()
         mock_init.assert_not_called()
 
     def test_parse_required_modifier(self, mocker):
-        def fake_get_modifier(name, value, addr, modifiers):
-            modifiers[name] = modifiers_map[name]
         actions_map = {
             'test': mocker.Mock(eager=False),
         }
@@ -703,22 +845,20 @@ class TestStep(object):
         }
         for name, modifier in modifiers_map.items():
             modifier.name = name
-        mock_get_action = mocker.patch.object(
-            StepForTest, '_get_action',
-            side_effect=lambda name, value, addr, action: actions_map[name],
-        )
-        mock_get_modifier = mocker.patch.object(
-            StepForTest, '_get_modifier',
-            side_effect=fake_get_modifier,
+        mock_lookup = mocker.patch.object(
+            StepForTest, '_lookup',
+            side_effect=make_lookup(mocker, actions_map, modifiers_map),
         )
+        mocker.patch.object(StepForTest, '_compat_cache', set())
         mock_sort_modifiers = mocker.patch.object(
-            steps.utils, '_sort_modifiers',
+            StepForTest, '_sort_modifiers',
             return_value='sorted',
         )
         mock_init = mocker.patch.object(
             StepForTest, '__init__',
             return_value=None,
         )
+        addr = addresses.StepAddress('file.name', '/some/path')
         config = {
             'test': 'action config',
             'mod1': 'mod1 config',
@@ -729,23 +869,42 @@ class TestStep(object):
         }
 
         with pytest.raises(exceptions.StepError):
-            StepForTest.parse(config, 'addr')
-        mock_get_action.assert_has_calls([
-            mocker.call('test', 'action config', 'addr', None),
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
-        ], any_order=True)
-        assert mock_get_action.call_count == 4
-        mock_get_modifier.assert_has_calls([
-            mocker.call('mod1', 'mod1 config', 'addr', mocker.ANY),
-            mocker.call('mod2', 'mod2 config', 'addr', mocker.ANY),
-            mocker.call('mod3', 'mod3 config', 'addr', mocker.ANY),
+            StepForTest.parse(config, addr)
+        mock_lookup.assert_has_calls([
+            mocker.call('test'),
+            mocker.call('mod1'),
+            mocker.call('mod2'),
+            mocker.call('mod3'),
         ], any_order=True)
-        assert mock_get_modifier.call_count == 3
+        assert mock_lookup.call_count == 4
         mock_sort_modifiers.assert_not_called()
         mock_init.assert_not_called()
 
+    def test_check_modifiers_cached(self, mocker):
+        action = mocker.Mock(eager=False)
+        modifier = mocker.Mock(
+            restriction=steps.Modifier.EAGER,
+            prohibited=set(), required=set(),
+        )
+        mocker.patch.object(StepForTest, '_compat_cache', set([
+            (frozenset(['mod1']), steps.Modifier.LAZY),
+        ]))
+
+        StepForTest._check_modifiers(action, {'mod1': modifier}, 'addr')
+
+    def test_check_modifiers_cache_full(self, mocker):
+        action = mocker.Mock(eager=False)
+        modifier = mocker.Mock(
+            restriction=steps.Modifier.ALL,
+            prohibited=set(), required=set(),
+        )
+        mocker.patch.object(steps, '_CLASS_CACHE_SIZE', 0)
+        mocker.patch.object(StepForTest, '_compat_cache', set())
+
+        StepForTest._check_modifiers(action, {'mod1': modifier}, 'addr')
+
+        assert StepForTest._compat_cache == set()
+
     def test_parse_list(self, mocker):
         steps = [
             mocker.Mock(eager=False, return_value='step1'),
@@ -870,6 +1029,53 @@ class TestStep(object):
         modifiers[1].post_call.assert_not_called()
         modifiers[0].post_call.assert_not_called()
 
+    def test_evaluate_no_modifiers(self, mocker):
+        action = mocker.Mock(return_value='action')
+        obj = StepForTest('action', 'addr', 'modifiers')
+
+        result = obj.evaluate('ctxt', [], [], action)
+
+        assert result == 'action'
+        action.assert_called_once_with(obj, 'ctxt')
+
+    def test_evaluate_no_modifiers_fails(self, mocker):
+        action = mocker.Mock(side_effect=ExceptionForTest())
+        obj = StepForTest('action', 'addr', 'modifiers')
+
+        result = obj.evaluate('ctxt', [], [], action)
+
+        assert isinstance(result, steps.ExceptionResult)
+        assert result.type_ == ExceptionForTest
+        action.assert_called_once_with(obj, 'ctxt')
+
+    def test_evaluate_lists_copied(self, mocker):
+        def fake_pre_call(step, ctxt, pre_mod, post_mod, action):
+            pre_mod.append('junk')
+            post_mod.append('junk')
+        modifiers = [
+            mocker.Mock(**{
+                'pre_call.side_effect': fake_pre_call,
+                'post_call.return_value': 'mod%d' % i,
+            })
+            for i in range(3)
+        ]
+        pre_call = modifiers[:1]
+        post_call = modifiers[1:]
+        action = mocker.Mock(return_value='action')
+        obj = StepForTest('action', 'addr', 'modifiers')
+
+        result = obj.evaluate('ctxt', pre_call, post_call, action)
+
+        assert result == 'mod1'
+        assert pre_call == modifiers[:1]
+        assert post_call == modifiers[1:]
+        modifiers[2].post_call.assert_called_once_with(
+            obj, 'ctxt', 'action', action, [], modifiers[:2],
+        )
+        modifiers[1].post_call.assert_called_once_with(
+            obj, 'ctxt', 'mod2', action, modifiers[2:], modifiers[:1],
+        )
+
     def test_evaluate_skipped(self, mocker):
         modifiers = [
             mocker.Mock(**{'post_call.return_value': 'mod%d' % i})
@@ -1020,3 +1226,18 @@ class TestStep(object):
         obj = StepForTest(action, 'addr')
 
         assert obj.eager == 'eager'
+
+    def test_slots(self, mocker):
+        class SlottedForTest(steps.Step):
+            __slots__ = ()
+            namespace_actions = 'stepmaker.actions'
+            namespace_modifiers = 'stepmaker.modifiers'
+
+            def validate(self, metadata, addr):
+                return metadata
+
+        result = SlottedForTest('action', 'addr')
+
+        assert not hasattr(result, '__dict__')
+        assert result.action == 'action'
+        assert result.metadata == {}
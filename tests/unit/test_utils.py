@@ -1,3 +1,6 @@
+import os
+import pathlib
+
 import pytest
 
 from stepmaker import addresses
@@ -15,32 +18,21 @@ class ValidationException(Exception):
         self.path = path
 
 
-class TestCanonicalizePath(object):
-    def test_absolute(self, mocker):
-        mocker.patch.object(
-            utils.os.path, 'isabs',
-            return_value=True,
-        )
-        mock_join = mocker.patch.object(
-            utils.os.path, 'join',
-            return_value='/joined/path',
-        )
-        mock_abspath = mocker.patch.object(
-            utils.os.path, 'abspath',
-            return_value='/absolute/path',
-        )
+class BaseExceptionForTest(BaseException):
+    path = ['a', 1]
 
-        result = utils._canonicalize_path('/some/path', '/other/path')
 
-        assert result == '/absolute/path'
-        mock_join.assert_not_called()
-        mock_abspath.assert_called_once_with('/other/path')
+class TestIsabs(object):
+    @pytest.mark.parametrize('path', [
+        '/some/path', 'some/path', '', '.', b'/some/path', b'some/path',
+        pathlib.PurePath('/some/path'), pathlib.PurePath('some/path'),
+    ])
+    def test_matches_isabs(self, path):
+        assert utils._isabs(path) == os.path.isabs(path)
 
-    def test_relative(self, mocker):
-        mocker.patch.object(
-            utils.os.path, 'isabs',
-            return_value=False,
-        )
+
+class TestCanonicalizePath(object):
+    def test_base(self, mocker):
         mock_join = mocker.patch.object(
             utils.os.path, 'join',
             return_value='/joined/path',
@@ -56,6 +48,16 @@ class TestCanonicalizePath(object):
         mock_join.assert_called_once_with('/some/path', 'other/path')
         mock_abspath.assert_called_once_with('/joined/path')
 
+    def test_absolute(self):
+        result = utils._canonicalize_path('/some/path', '/other/../path')
+
+        assert result == '/path'
+
+    def test_relative(self):
+        result = utils._canonicalize_path('/some/path', 'other/../file')
+
+        assert result == '/some/path/file'
+
 
 class TestInheritSet(object):
     def test_base(self, mocker):
@@ -78,6 +80,8 @@ class TestInheritSet(object):
             'd': set(['h']),
             'e': set(),
         }
+        for value in namespace.values():
+            assert isinstance(value, frozenset)
 
 
 class TestSortVisit(object):
@@ -88,7 +92,7 @@ class TestSortVisit(object):
             'd': {'before': ['b'], 'mod': '<d>'},
             'e': {'before': ['f'], 'mod': '<e>'},
         }
-        node = {'before': ['c', 'd', 'f'], 'mod': '<a>'}
+        node = {'before': ['f', 'd', 'c'], 'mod': '<a>'}
         result = []
 
         utils._sort_visit(adjacency, result, node)
@@ -116,10 +120,10 @@ class TestSortModifiers(object):
             'e': mocker.Mock(before=set(['f']), after=set()),
         }
         adjacency = {
-            'a': {'before': set(['c', 'd']), 'mod': modifiers['a']},
-            'b': {'before': set(['d']), 'mod': modifiers['b']},
-            'd': {'before': set(['b']), 'mod': modifiers['d']},
-            'e': {'before': set(), 'mod': modifiers['e']},
+            'a': {'before': ['d', 'c'], 'mod': modifiers['a']},
+            'b': {'before': ['d'], 'mod': modifiers['b']},
+            'd': {'before': ['b'], 'mod': modifiers['d']},
+            'e': {'before': [], 'mod': modifiers['e']},
         }
 
         result = utils._sort_modifiers(modifiers)
@@ -131,6 +135,23 @@ class TestSortModifiers(object):
         ])
         assert mock_sort_visit.call_count == len(adjacency)
 
+    def test_empty(self, mocker):
+        mock_sort_visit = mocker.patch.object(utils, '_sort_visit')
+
+        result = utils._sort_modifiers({})
+
+        assert result == []
+        mock_sort_visit.assert_not_called()
+
+    def test_single(self, mocker):
+        mock_sort_visit = mocker.patch.object(utils, '_sort_visit')
+        modifier = mocker.Mock(before=set(['b']), after=set(['c']))
+
+        result = utils._sort_modifiers({'a': modifier})
+
+        assert result == [modifier]
+        mock_sort_visit.assert_not_called()
+
 
 class TestJsonschemaValidator(object):
     def test_base(self):
@@ -158,3 +179,17 @@ class TestJsonschemaValidator(object):
         assert isinstance(exc_info.value.addr, addresses.StepAddress)
         assert exc_info.value.addr.filename == 'file.name'
         assert exc_info.value.addr.path == 'path/a[1]/b[2]'
+
+    def test_non_sequence_path(self):
+        addr = addresses.StepAddress('file.name', 'path')
+
+        with pytest.raises(ValidationException):
+            with utils.jsonschema_validator(addr):
+                raise ValidationException('some message', 42)
+
+    def test_not_exception(self):
+        addr = addresses.StepAddress('file.name', 'path')
+
+        with pytest.raises(BaseExceptionForTest):
+            with utils.jsonschema_validator(addr):
+                raise BaseExceptionForTest()